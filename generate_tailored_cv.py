@@ -18,6 +18,7 @@ import argparse
 import logging
 import tempfile
 from pathlib import Path
+from concurrent.futures import Executor
 from typing import Optional
 import json
 
@@ -62,13 +63,21 @@ class CVTailoringService:
         self.cv_generator = CVGenerator()
         self.file_processor = FileProcessor()
     
+    async def aclose(self):
+        """Close the OpenAI clients and their connection pools"""
+        self.cv_analyzer.client.close()
+        self.job_analyzer.client.close()
+        self.cv_optimizer.client.close()
+        await self.job_analyzer.aclient.close()
+    
     def generate_tailored_cv(
         self,
         cv_file_path: str,
         job_description: str,
         output_path: str,
         template_style: str = "modern",
-        include_analysis: bool = True
+        include_analysis: bool = True,
+        pdf_executor: Optional[Executor] = None
     ) -> dict:
         """
         Generate a tailored CV in PDF format
@@ -79,6 +88,7 @@ class CVTailoringService:
             output_path: Path for the output PDF
             template_style: CV template style (modern, professional, creative)
             include_analysis: Whether to include analysis report
+            pdf_executor: Optional executor (e.g. a process pool) to render the PDF in
             
         Returns:
             Dictionary with results and metadata
@@ -110,7 +120,13 @@ class CVTailoringService:
             # Step 5: Generate PDF
             logger.info("Generating PDF CV...")
             self.cv_generator.template_style = template_style
-            pdf_path = self.cv_generator.generate_pdf(optimization_result.optimized_cv, output_path)
+            if pdf_executor is not None:
+                # Rendering is CPU-bound; the generator and CV data are pickled to the executor
+                pdf_path = pdf_executor.submit(
+                    self.cv_generator.generate_pdf, optimization_result.optimized_cv, output_path
+                ).result()
+            else:
+                pdf_path = self.cv_generator.generate_pdf(optimization_result.optimized_cv, output_path)
             
             # Step 6: Prepare results
             results = {
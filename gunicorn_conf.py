@@ -0,0 +1,28 @@
+"""
+Gunicorn configuration for the CV Tailoring Web UI
+
+Usage:
+    gunicorn -c gunicorn_conf.py web_ui:app
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# In-process jobs are only visible to the worker that started them, so several workers need the Celery queue
+default_workers = (os.cpu_count() or 1) * 2 + 1 if os.getenv("REDIS_URL") else 1
+workers = int(os.getenv("WEB_UI_WORKERS", default_workers))
+worker_class = "uvicorn.workers.UvicornWorker"
+worker_connections = 1000
+
+# Import web_ui once before forking so workers share the pre-encoded page and other module constants;
+# the OpenAI clients are still created per worker in the app lifespan
+preload_app = True
+
+# CV generation can take minutes
+timeout = 600
+graceful_timeout = 30
+keepalive = 5
+
+loglevel = "info"
+accesslog = "-"
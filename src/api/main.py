@@ -166,7 +166,7 @@ async def optimize_cv(
             
             # Analyze job description
             job_analyzer = services["job_analyzer"]
-            job_analysis = job_analyzer.analyze_job_description(job_description)
+            job_analysis = await job_analyzer.analyze_job_description_async(job_description)
             
             # Optimize CV
             cv_optimizer = services["cv_optimizer"]
@@ -225,7 +225,7 @@ async def analyze_job(
     """
     try:
         job_analyzer = services["job_analyzer"]
-        job_analysis = job_analyzer.analyze_job_description(request.job_description)
+        job_analysis = await job_analyzer.analyze_job_description_async(request.job_description)
         
         return JobAnalysisResponse(
             success=True,
@@ -2,28 +2,294 @@
 CV optimizer for the smart CV writer service
 """
 import re
-import json
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from collections import Counter
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Annotated, Dict, Any, Callable, List, Optional, Set, Tuple, TypeVar
 from datetime import datetime
 from difflib import SequenceMatcher
 
 from openai import OpenAI
+from pydantic import BaseModel, Field, ValidationError
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from ..utils.fast_json import json_dumps, json_loads
 from ..models.cv_data import CVData, EmploymentDetail, Skill, Project, CVOptimizationResult
 from ..models.job_data import JobDescription, JobAnalysisResult
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Word count bounds a generated summary must fall within to be accepted
+SUMMARY_WORD_LIMITS = (5, 250)
+
+# Score contributed by each job description term category when found in CV text
+JOB_RELEVANCE_WEIGHTS = {"required": 0.2, "technology": 0.1, "industry": 0.1}
+PROJECT_RELEVANCE_WEIGHTS = {"required": 0.3, "technology": 0.2}
+
+# Skip the LLM rewrite when the text already covers this share of the job terms
+SUMMARY_SKIP_MATCH = 0.85
+JOB_SKIP_SKILL_COVERAGE = 0.7
+
+# Change tags recorded by _apply_optimizations -> improvement shown to the user
+IMPROVEMENT_MESSAGES = {
+    "summary": "Professional summary optimized for job requirements",
+    "technical_skills_added": "Added missing technical skills",
+    "employment_rewritten": "Job descriptions enhanced with relevant keywords and achievements",
+    "keywords_indexed": "Improved keyword distribution for ATS optimization",
+}
+
+# Skill relevance by the job description list a skill matches, highest tier first
+SKILL_TIER_WEIGHTS = {"required": 1.0, "preferred": 0.8, "technology": 0.7, "keyword": 0.6}
+
+SKILL_RELATIONSHIPS = {
+    "python": ("django", "flask", "fastapi", "pandas", "numpy"),
+    "javascript": ("react", "vue", "angular", "node.js", "typescript"),
+    "aws": ("ec2", "s3", "lambda", "cloudformation"),
+    "docker": ("kubernetes", "containerization"),
+    "sql": ("postgresql", "mysql", "sqlite", "database"),
+    "git": ("github", "gitlab", "version control"),
+    "machine learning": ("tensorflow", "pytorch", "scikit-learn", "ml"),
+}
+
+
+def _scan_related_skills(skill_lower: str) -> Tuple[str, ...]:
+    """Find the related skill group of a skill by substring matching"""
+    for main_skill, related in SKILL_RELATIONSHIPS.items():
+        if skill_lower in main_skill or main_skill in skill_lower:
+            return related
+        for related_skill in related:
+            if skill_lower in related_skill or related_skill in skill_lower:
+                return related
+    return ()
+
+
+# Every main and related skill -> the group the substring scan resolves it to
+RELATED_SKILL_INDEX = {
+    term: _scan_related_skills(term)
+    for main_skill, related in SKILL_RELATIONSHIPS.items()
+    for term in (main_skill, *related)
+}
+
+
+@lru_cache(maxsize=4096)
+def related_skills_for(skill_lower: str) -> Tuple[str, ...]:
+    """Get the related skill group of a lowercased skill, memoized per skill"""
+    related = RELATED_SKILL_INDEX.get(skill_lower)
+    if related is not None:
+        return related
+    return _scan_related_skills(skill_lower)
+
+
+class JobTermMatcher:
+    """Finds job description terms in CV text with a single multi-pattern pass"""
+    
+    def __init__(self, terms: Dict[str, List[str]]):
+        # Lowercased term -> categories it was listed under (one entry per listing)
+        self.terms = terms
+        self._always_found = {"": terms[""]} if "" in terms else {}
+        self._automaton = None
+        
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for term, categories in terms.items():
+                if term:
+                    automaton.add_word(term, (term, categories))
+            if len(automaton):
+                automaton.make_automaton()
+                self._automaton = automaton
+    
+    @classmethod
+    def from_categories(cls, sources: Dict[str, Tuple[str, ...]]) -> 'JobTermMatcher':
+        """Build a matcher from category -> lowercased terms"""
+        terms: Dict[str, List[str]] = {}
+        for category, values in sources.items():
+            for value in values:
+                terms.setdefault(value, []).append(category)
+        return cls(terms)
+    
+    def find(self, text_lower: str) -> Dict[str, List[str]]:
+        """Return every term occurring in the (already lowercased) text"""
+        found = dict(self._always_found)
+        if self._automaton is not None:
+            for _, (term, categories) in self._automaton.iter(text_lower):
+                found[term] = categories
+        else:
+            for term, categories in self.terms.items():
+                if term in text_lower:
+                    found[term] = categories
+        return found
+    
+    def count(self, text_lower: str) -> Counter:
+        """Count non-overlapping occurrences of every term, like str.count"""
+        counts: Counter = Counter()
+        if "" in self.terms:
+            counts[""] = len(text_lower) + 1
+        
+        if self._automaton is not None:
+            last_end: Dict[str, int] = {}
+            for end, (term, _) in self._automaton.iter(text_lower):
+                if end - len(term) >= last_end.get(term, -1):
+                    counts[term] += 1
+                    last_end[term] = end
+        else:
+            for term in self.terms:
+                if term and term in text_lower:
+                    counts[term] = text_lower.count(term)
+        return counts
+    
+    def find_with_prefix(self, text_lower: str, prefix_len: int) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+        """Return the terms found in the whole text and those found within its first prefix_len characters"""
+        if self._automaton is None:
+            return self.find(text_lower), self.find(text_lower[:prefix_len])
+        
+        found = dict(self._always_found)
+        prefix_found = dict(self._always_found)
+        for end, (term, categories) in self._automaton.iter(text_lower):
+            found[term] = categories
+            if end < prefix_len:
+                prefix_found[term] = categories
+        return found, prefix_found
+    
+    @staticmethod
+    def count_categories(found: Dict[str, List[str]]) -> Counter:
+        """Count matched term listings per category"""
+        return Counter(category for categories in found.values() for category in categories)
+    
+    @classmethod
+    def weighted_score(cls, found: Dict[str, List[str]], weights: Dict[str, float]) -> float:
+        """Sum category weights over matched term listings"""
+        counts = cls.count_categories(found)
+        return sum(counts[category] * weight for category, weight in weights.items())
+
+
+@dataclass(frozen=True)
+class JobTermCache:
+    """Lowercased job description terms, computed once per job"""
+    title_lower: str
+    required_lower: Tuple[str, ...]
+    preferred_lower: Tuple[str, ...]
+    tech_lower: Tuple[str, ...]
+    keywords_lower: Tuple[str, ...]
+    industry_lower: Tuple[str, ...]
+    matcher: JobTermMatcher
+    # Lowercased skill/keyword -> highest tier weight it is listed under
+    tier_map: Dict[str, float]
+    # Unique tier tokens with their weight, highest weight first
+    tier_tokens: Tuple[Tuple[str, float], ...]
+
+
+def _prepare_job_lowercase_cache(job_desc: JobDescription) -> JobTermCache:
+    """Lowercase every job description term used by the scoring functions"""
+    required_lower = tuple(s.skill_name.lower() for s in job_desc.required_skills)
+    preferred_lower = tuple(s.skill_name.lower() for s in job_desc.preferred_skills)
+    tech_lower = tuple(t.lower() for t in job_desc.technology_stack)
+    keywords_lower = tuple(k.lower() for k in job_desc.keywords)
+    industry_lower = tuple(k.lower() for k in job_desc.industry_keywords)
+    
+    matcher = JobTermMatcher.from_categories({
+        "required": required_lower,
+        "technology": tech_lower,
+        "industry": industry_lower,
+        "keyword": keywords_lower,
+    })
+    
+    tier_map: Dict[str, float] = {}
+    for tier, tokens in (
+        ("required", required_lower),
+        ("preferred", preferred_lower),
+        ("technology", tech_lower),
+        ("keyword", keywords_lower),
+    ):
+        for token in tokens:
+            tier_map.setdefault(token, SKILL_TIER_WEIGHTS[tier])
+    tier_tokens = tuple(sorted(tier_map.items(), key=lambda item: item[1], reverse=True))
+    
+    return JobTermCache(
+        title_lower=job_desc.title.lower(),
+        required_lower=required_lower,
+        preferred_lower=preferred_lower,
+        tech_lower=tech_lower,
+        keywords_lower=keywords_lower,
+        industry_lower=industry_lower,
+        matcher=matcher,
+        tier_map=tier_map,
+        tier_tokens=tier_tokens,
+    )
+
+
+class JobRewrite(BaseModel):
+    """Schema of an optimized job description returned by the model; empty rewrites fail validation"""
+    description: Annotated[List[str], Field(min_length=1)]
+    achievements: Annotated[List[str], Field(min_length=1)]
+
+
+class BulkJobRewrite(JobRewrite):
+    """Schema of one entry in a bulk employment history response"""
+    idx: int
+
+
+class CVTextContext:
+    """Text views of a CV, computed lazily and shared across scoring passes"""
+    
+    def __init__(self, cv_data: CVData):
+        self.cv_data = cv_data
+    
+    @cached_property
+    def all_skills_list(self) -> List[str]:
+        return self.cv_data.get_all_skills()
+    
+    @cached_property
+    def all_skills_lower(self) -> frozenset:
+        return self.cv_data.get_all_skills_lower()
+    
+    @cached_property
+    def summary_lower(self) -> str:
+        return self.cv_data.summary.lower()
+    
+    @cached_property
+    def combined_lower(self) -> str:
+        """Summary and all skills as one lowercased string"""
+        return f"{self.cv_data.summary} {' '.join(self.all_skills_list)}".lower()
+    
+    def has_skill(self, skill_lower: str) -> bool:
+        """Check whether any CV skill contains the lowercased skill name"""
+        cv_skills = self.all_skills_lower
+        return skill_lower in cv_skills or any(skill_lower in cv_skill for cv_skill in cv_skills)
+
 
 class CVOptimizer:
     """Main CV optimization engine"""
     
-    def __init__(self, api_key: str, model: str = "gpt-4-turbo", temperature: float = 0.1):
+    def __init__(self, api_key: str, model: str = "gpt-4-turbo", temperature: float = 0.1,
+                 fast_model: Optional[str] = "gpt-4o-mini"):
         self.api_key = api_key
+        # Requests go to fast_model first and escalate to model when the output fails validation
         self.model = model
+        self.fast_model = fast_model
         self.temperature = temperature
         self.client = OpenAI(api_key=api_key)
+        # (job description, lowercased terms) built once per optimization run
+        self._job_cache: Optional[Tuple[JobDescription, JobTermCache]] = None
         
     def optimize_cv(self, cv_data: CVData, job_analysis: JobAnalysisResult) -> CVOptimizationResult:
         """Optimize CV to match job description"""
@@ -34,16 +300,17 @@ class CVOptimizer:
             original_cv = cv_data
             
             # Apply optimizations
-            optimized_cv = self._apply_optimizations(cv_data, job_analysis)
+            optimized_cv, changes = self._apply_optimizations(cv_data, job_analysis)
+            cv_ctx = CVTextContext(optimized_cv)
             
             # Calculate optimization score
-            optimization_score = self._calculate_optimization_score(optimized_cv, job_analysis)
+            optimization_score = self._calculate_optimization_score(optimized_cv, job_analysis, cv_ctx)
             
             # Generate improvements list
-            improvements = self._generate_improvements_list(original_cv, optimized_cv, job_analysis)
+            improvements = self._generate_improvements_list(changes)
             
             # Identify skill gaps
-            skill_gaps = self._identify_skill_gaps(optimized_cv, job_analysis)
+            skill_gaps = self._identify_skill_gaps(optimized_cv, job_analysis, cv_ctx)
             
             # Calculate keyword matches
             keyword_matches = self._calculate_keyword_matches(optimized_cv, job_analysis)
@@ -64,41 +331,67 @@ class CVOptimizer:
             logger.error(f"Error optimizing CV: {str(e)}")
             raise
     
-    def _apply_optimizations(self, cv_data: CVData, job_analysis: JobAnalysisResult) -> CVData:
-        """Apply all optimization strategies"""
+    def _apply_optimizations(self, cv_data: CVData, job_analysis: JobAnalysisResult) -> Tuple[CVData, Set[str]]:
+        """Apply all optimization strategies, returning the CV and tags of what changed"""
         optimized_cv = cv_data
+        changes: Set[str] = set()
+        
+        # Lowercase the job terms once for all scoring passes of this run
+        job_desc = job_analysis.job_description
+        self._job_cache = (job_desc, _prepare_job_lowercase_cache(job_desc))
         
         # 1. Optimize summary
-        optimized_cv.summary = self._optimize_summary(cv_data.summary, job_analysis)
+        original_summary = cv_data.summary
+        optimized_cv.summary = self._optimize_summary(original_summary, job_analysis)
+        if optimized_cv.summary is not original_summary:
+            changes.add("summary")
         
         # 2. Optimize skills
         optimized_cv.technical_skills = self._optimize_skills(cv_data.technical_skills, job_analysis, "technical")
         optimized_cv.soft_skills = self._optimize_skills(cv_data.soft_skills, job_analysis, "soft")
+        optimized_cv.invalidate_skill_cache()
         
         # 3. Optimize employment history
-        optimized_cv.employment_history = self._optimize_employment_history(cv_data.employment_history, job_analysis)
+        optimized_cv.employment_history = self._optimize_employment_history(cv_data.employment_history, job_analysis, changes)
+        optimized_cv.invalidate_employment_cache()
         
         # 4. Optimize projects
         optimized_cv.projects = self._optimize_projects(cv_data.projects, job_analysis)
         
         # 5. Add missing skills
-        self._add_missing_skills(optimized_cv, job_analysis)
+        self._add_missing_skills(optimized_cv, job_analysis, changes)
         
         # 6. Optimize keywords
         self._optimize_keywords(optimized_cv, job_analysis)
+        if optimized_cv.keyword_matches:
+            changes.add("keywords_indexed")
         
         # Update metadata
         optimized_cv.optimization_date = datetime.now()
         optimized_cv.target_job_title = job_analysis.job_description.title
         optimized_cv.target_company = job_analysis.job_description.company.name
         
-        return optimized_cv
+        return optimized_cv, changes
+    
+    def _get_job_cache(self, job_analysis: JobAnalysisResult) -> JobTermCache:
+        """Get the lowercased job terms, rebuilding them if the job changed"""
+        job_desc = job_analysis.job_description
+        cached = self._job_cache
+        if cached is not None and cached[0] is job_desc:
+            return cached[1]
+        
+        job_cache = _prepare_job_lowercase_cache(job_desc)
+        self._job_cache = (job_desc, job_cache)
+        return job_cache
     
     def _optimize_summary(self, summary: str, job_analysis: JobAnalysisResult) -> str:
         """Optimize professional summary for the job"""
         if not summary:
             return self._generate_summary(job_analysis)
         
+        if self._summary_match_ratio(summary, job_analysis) >= SUMMARY_SKIP_MATCH:
+            return summary
+        
         system_prompt = """
         You are an expert CV writer. Optimize the provided professional summary to better match the job requirements.
         
@@ -122,24 +415,45 @@ class CVOptimizer:
         Industry: {job_analysis.job_description.company.industry}
         """
         
+        required_lower = self._get_job_cache(job_analysis).required_lower
+        summary_lower = summary.lower()
+        kept_skills = [skill for skill in required_lower if skill and skill in summary_lower]
+        
+        def parse(content: str) -> Optional[str]:
+            # Reject rewrites that drop required skills the summary already mentioned
+            optimized_summary = self._parse_summary(content)
+            if optimized_summary is None:
+                return None
+            optimized_lower = optimized_summary.lower()
+            if any(skill not in optimized_lower for skill in kept_skills):
+                return None
+            return optimized_summary
+        
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            optimized_summary = self._complete_with_escalation(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": f"Job Context:\n{job_context}\n\nCurrent Summary:\n{summary}"}
                 ],
-                temperature=self.temperature,
-                max_tokens=300
+                max_tokens=300,
+                parse=parse
             )
-            
-            optimized_summary = response.choices[0].message.content.strip()
             return optimized_summary if optimized_summary else summary
             
         except Exception as e:
             logger.error(f"Error optimizing summary: {str(e)}")
             return summary
     
+    def _summary_match_ratio(self, summary: str, job_analysis: JobAnalysisResult) -> float:
+        """Share of job keywords and required skills already mentioned in the summary"""
+        job_cache = self._get_job_cache(job_analysis)
+        total_expected = len(job_cache.keywords_lower) + len(job_cache.required_lower)
+        if total_expected == 0:
+            return 0.0
+        
+        counts = JobTermMatcher.count_categories(job_cache.matcher.find(summary.lower()))
+        return (counts["keyword"] + counts["required"]) / total_expected
+    
     def _generate_summary(self, job_analysis: JobAnalysisResult) -> str:
         """Generate a new professional summary based on job requirements"""
         system_prompt = """
@@ -166,22 +480,57 @@ class CVOptimizer:
         Responsibilities: {'; '.join(job_analysis.job_description.responsibilities[:5])}
         """
         
+        default_summary = "Experienced professional with strong technical skills and proven track record of delivering results."
+        
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            generated_summary = self._complete_with_escalation(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": f"Job Context:\n{job_context}"}
                 ],
-                temperature=self.temperature,
-                max_tokens=300
+                max_tokens=300,
+                parse=self._parse_summary
             )
-            
-            return response.choices[0].message.content.strip()
+            return generated_summary if generated_summary else default_summary
             
         except Exception as e:
             logger.error(f"Error generating summary: {str(e)}")
-            return "Experienced professional with strong technical skills and proven track record of delivering results."
+            return default_summary
+    
+    def _complete_with_escalation(self, messages: List[Dict[str, str]], max_tokens: int,
+                                  parse: Callable[[str], Optional[T]],
+                                  response_format: Optional[Dict[str, str]] = None) -> Optional[T]:
+        """Run a chat completion on the fast model, retrying once on the quality model if parsing fails"""
+        models = [self.fast_model, self.model] if self.fast_model and self.fast_model != self.model else [self.model]
+        extra_args = {"response_format": response_format} if response_format else {}
+        
+        for model in models:
+            try:
+                response = self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=self.temperature,
+                    max_tokens=max_tokens,
+                    **extra_args
+                )
+            except Exception as e:
+                logger.warning(f"Completion with {model} failed: {str(e)}")
+                continue
+            
+            content = response.choices[0].message.content
+            result = parse(content) if content else None
+            if result is not None:
+                return result
+            logger.info(f"Output from {model} failed validation")
+        
+        return None
+    
+    @staticmethod
+    def _parse_summary(content: str) -> Optional[str]:
+        """Accept a summary only if its length is within bounds"""
+        summary = content.strip()
+        min_words, max_words = SUMMARY_WORD_LIMITS
+        return summary if min_words <= len(summary.split()) <= max_words else None
     
     def _optimize_skills(self, skills: List[Skill], job_analysis: JobAnalysisResult, category: str) -> List[Skill]:
         """Optimize skills list for the job"""
@@ -189,8 +538,9 @@ class CVOptimizer:
             return skills
         
         # Calculate relevance scores for existing skills
-        for skill in skills:
-            skill.relevance_score = self._calculate_skill_relevance(skill.name, job_analysis)
+        scores = self._calculate_skill_relevances([skill.name for skill in skills], job_analysis)
+        for skill, score in zip(skills, scores):
+            skill.relevance_score = score
         
         # Sort skills by relevance
         skills.sort(key=lambda x: x.relevance_score, reverse=True)
@@ -207,125 +557,249 @@ class CVOptimizer:
     
     def _calculate_skill_relevance(self, skill_name: str, job_analysis: JobAnalysisResult) -> float:
         """Calculate relevance score for a skill"""
-        job_desc = job_analysis.job_description
+        job_cache = self._get_job_cache(job_analysis)
         skill_lower = skill_name.lower()
         
-        # Check required skills (highest weight)
-        for skill in job_desc.required_skills:
-            if skill_lower in skill.skill_name.lower() or skill.skill_name.lower() in skill_lower:
-                return 1.0
-        
-        # Check preferred skills (medium weight)
-        for skill in job_desc.preferred_skills:
-            if skill_lower in skill.skill_name.lower() or skill.skill_name.lower() in skill_lower:
-                return 0.8
+        # Exact hit on a required/preferred skill, technology or keyword.
+        # A partial match can only beat it in a higher tier, so stop scanning there.
+        exact_weight = job_cache.tier_map.get(skill_lower, 0.0)
         
-        # Check technology stack
-        for tech in job_desc.technology_stack:
-            if skill_lower in tech.lower() or tech.lower() in skill_lower:
-                return 0.7
+        # Partial match, checking tiers from highest weight down
+        for token, weight in job_cache.tier_tokens:
+            if weight <= exact_weight:
+                return exact_weight
+            if skill_lower in token or token in skill_lower:
+                return weight
         
-        # Check keywords
-        for keyword in job_desc.keywords:
-            if skill_lower in keyword.lower() or keyword.lower() in skill_lower:
-                return 0.6
-        
-        # Check for related skills
+        return self._related_skill_relevance(skill_name, job_cache)
+    
+    def _calculate_skill_relevances(self, skill_names: List[str], job_analysis: JobAnalysisResult) -> List[float]:
+        """Calculate relevance scores for several skills, matching them all against the job terms at once"""
+        job_cache = self._get_job_cache(job_analysis)
+        tier_tokens = [(token, weight) for token, weight in job_cache.tier_tokens if token]
+        if not (RAPIDFUZZ_AVAILABLE and NUMPY_AVAILABLE) or not tier_tokens:
+            return [self._calculate_skill_relevance(name, job_analysis) for name in skill_names]
+        
+        names_lower = [name.lower() for name in skill_names]
+        tokens = [token for token, _ in tier_tokens]
+        weights = np.array([weight for _, weight in tier_tokens])
+        
+        # partial_ratio is 100 exactly when the shorter string occurs in the longer one,
+        # so each row marks the job terms a skill contains or is contained in
+        similarity = process.cdist(names_lower, tokens, scorer=fuzz.partial_ratio, score_cutoff=100, dtype=np.uint8)
+        best_weights = np.where(similarity == 100, weights, 0.0).max(axis=1).tolist()
+        # An empty job term is contained in every skill name
+        floor = job_cache.tier_map.get("", 0.0)
+        
+        scores = []
+        for name, name_lower, weight in zip(skill_names, names_lower, best_weights):
+            weight = max(weight, floor)
+            if not name_lower:
+                scores.append(self._calculate_skill_relevance(name, job_analysis))
+            elif weight > 0:
+                scores.append(weight)
+            else:
+                scores.append(self._related_skill_relevance(name, job_cache))
+        return scores
+    
+    def _related_skill_relevance(self, skill_name: str, job_cache: JobTermCache) -> float:
+        """Score a skill with no direct job match by its related skills"""
         related_skills = self._get_related_skills(skill_name)
         for related in related_skills:
-            for skill in job_desc.required_skills + job_desc.preferred_skills:
-                if related.lower() in skill.skill_name.lower():
+            for job_skill in job_cache.required_lower + job_cache.preferred_lower:
+                if related in job_skill:
                     return 0.5
         
         return 0.1  # Default low relevance
     
-    def _get_related_skills(self, skill_name: str) -> List[str]:
+    def _get_related_skills(self, skill_name: str) -> Tuple[str, ...]:
         """Get related skills for a given skill"""
-        skill_relationships = {
-            "python": ["django", "flask", "fastapi", "pandas", "numpy"],
-            "javascript": ["react", "vue", "angular", "node.js", "typescript"],
-            "aws": ["ec2", "s3", "lambda", "cloudformation"],
-            "docker": ["kubernetes", "containerization"],
-            "sql": ["postgresql", "mysql", "sqlite", "database"],
-            "git": ["github", "gitlab", "version control"],
-            "machine learning": ["tensorflow", "pytorch", "scikit-learn", "ml"],
-        }
-        
-        skill_lower = skill_name.lower()
-        for main_skill, related in skill_relationships.items():
-            if skill_lower in main_skill or main_skill in skill_lower:
-                return related
-            for related_skill in related:
-                if skill_lower in related_skill or related_skill in skill_lower:
-                    return related
-        
-        return []
+        return related_skills_for(skill_name.lower())
     
     def _extract_skill_keywords(self, skill_name: str, job_analysis: JobAnalysisResult) -> List[str]:
         """Extract relevant keywords for a skill"""
         keywords = []
         job_desc = job_analysis.job_description
+        keywords_lower = self._get_job_cache(job_analysis).keywords_lower
+        skill_lower = skill_name.lower()
         
         # Add skill name variations
         keywords.append(skill_name)
         
         # Add related keywords from job description
-        for keyword in job_desc.keywords:
-            if skill_name.lower() in keyword.lower() or keyword.lower() in skill_name.lower():
+        for keyword, keyword_lower in zip(job_desc.keywords, keywords_lower):
+            if skill_lower in keyword_lower or keyword_lower in skill_lower:
                 keywords.append(keyword)
         
         return list(set(keywords))[:5]  # Limit to 5 keywords
     
-    def _optimize_employment_history(self, employment_history: List[EmploymentDetail], job_analysis: JobAnalysisResult) -> List[EmploymentDetail]:
+    def _optimize_employment_history(self, employment_history: List[EmploymentDetail], job_analysis: JobAnalysisResult,
+                                     changes: Optional[Set[str]] = None) -> List[EmploymentDetail]:
         """Optimize employment history for the job"""
         if not employment_history:
             return employment_history
         
-        optimized_history = []
+        optimized_history = list(employment_history)
         
-        for job in employment_history:
-            # Calculate relevance score
+        # Calculate relevance scores
+        for job in optimized_history:
             job.relevance_score = self._calculate_job_relevance(job, job_analysis)
-            
-            # Optimize job description and achievements
-            optimized_job = self._optimize_job_description(job, job_analysis)
-            optimized_history.append(optimized_job)
         
         # Sort by relevance score
         optimized_history.sort(key=lambda x: x.relevance_score, reverse=True)
         
         # Limit to most relevant jobs
         max_jobs = 8  # Configurable
-        return optimized_history[:max_jobs]
+        optimized_history = optimized_history[:max_jobs]
+        
+        # Jobs that already cover most required skills are left as they are
+        pending = [job for job in optimized_history if not self._job_covers_requirements(job, job_analysis)]
+        if not pending:
+            return optimized_history
+        
+        # Optimize job descriptions and achievements in one request,
+        # falling back to one request per job for anything not returned
+        not_optimized = self._optimize_employment_history_bulk(pending, job_analysis)
+        rewritten = len(not_optimized) < len(pending)
+        for idx in not_optimized:
+            job = pending[idx]
+            description, achievements = job.description, job.achievements
+            self._optimize_job_description(job, job_analysis)
+            rewritten = rewritten or job.description is not description or job.achievements is not achievements
+        
+        if rewritten and changes is not None:
+            changes.add("employment_rewritten")
+        
+        return optimized_history
+    
+    def _optimize_employment_history_bulk(self, employment_history: List[EmploymentDetail], job_analysis: JobAnalysisResult) -> List[int]:
+        """Optimize all job descriptions with a single request, returning indices of jobs left unchanged"""
+        system_prompt = """
+        Optimize the description and achievements of each job to better match the job requirements.
+        
+        Guidelines:
+        1. Use action verbs from the job description
+        2. Include relevant keywords and skills
+        3. Quantify achievements where possible
+        4. Emphasize impact and results
+        5. Match the tone and style of the job description
+        6. Keep descriptions concise and impactful
+        
+        Return one entry per input job, keeping its idx, as JSON:
+        {
+          "jobs": [
+            {
+              "idx": 0,
+              "description": ["optimized description 1", "optimized description 2"],
+              "achievements": ["optimized achievement 1", "optimized achievement 2"]
+            }
+          ]
+        }
+        """
+        
+        jobs_payload = {
+            "jobs": [
+                {
+                    "idx": idx,
+                    "position": job.position,
+                    "company": job.company,
+                    "description": job.description,
+                    "achievements": job.achievements
+                }
+                for idx, job in enumerate(employment_history)
+            ]
+        }
+        
+        def parse(content: str) -> Optional[Dict[int, BulkJobRewrite]]:
+            # Keep every valid entry; only a response with none counts as a failure
+            try:
+                entries = json_loads(content).get("jobs")
+            except (ValueError, AttributeError):
+                return None
+            if not isinstance(entries, list):
+                return None
+            rewrites = {}
+            for entry in entries:
+                try:
+                    rewrite = BulkJobRewrite.model_validate(entry)
+                except ValidationError:
+                    continue
+                if 0 <= rewrite.idx < len(employment_history):
+                    rewrites[rewrite.idx] = rewrite
+            return rewrites or None
+        
+        try:
+            rewrites = self._complete_with_escalation(
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": "".join([
+                        "Job Context:\n", self._employment_job_context(job_analysis),
+                        "\n\nCurrent Jobs:\n", json_dumps(jobs_payload)
+                    ])}
+                ],
+                max_tokens=min(1000 * len(employment_history), 4000),
+                parse=parse,
+                response_format={"type": "json_object"}
+            )
+        except Exception as e:
+            logger.error(f"Error optimizing employment history in bulk: {str(e)}")
+            rewrites = None
+        
+        if rewrites is None:
+            return list(range(len(employment_history)))
+        
+        for idx, rewrite in rewrites.items():
+            self._apply_job_rewrite(employment_history[idx], rewrite)
+        return [idx for idx in range(len(employment_history)) if idx not in rewrites]
+    
+    @staticmethod
+    def _employment_job_context(job_analysis: JobAnalysisResult) -> str:
+        """Job context shared by the employment history prompts"""
+        return f"""
+        Job Title: {job_analysis.job_description.title}
+        Required Skills: {', '.join([s.skill_name for s in job_analysis.job_description.required_skills])}
+        Technology Stack: {', '.join(job_analysis.job_description.technology_stack)}
+        Action Verbs: {', '.join(job_analysis.job_description.keywords)}
+        """
     
     def _calculate_job_relevance(self, job: EmploymentDetail, job_analysis: JobAnalysisResult) -> float:
         """Calculate relevance score for a job position"""
-        job_desc = job_analysis.job_description
-        job_text = f"{job.position} {' '.join(job.description)} {' '.join(job.achievements)}".lower()
+        job_cache = self._get_job_cache(job_analysis)
+        job_text = self._job_text(job)
         
         relevance_score = 0.0
         
         # Check job title similarity
-        title_similarity = SequenceMatcher(None, job.position.lower(), job_desc.title.lower()).ratio()
+        title_similarity = self._title_similarity(job.position.lower(), job_cache.title_lower)
         relevance_score += title_similarity * 0.3
         
-        # Check for required skills in job description
-        for skill in job_desc.required_skills:
-            if skill.skill_name.lower() in job_text:
-                relevance_score += 0.2
-        
-        # Check for technology stack
-        for tech in job_desc.technology_stack:
-            if tech.lower() in job_text:
-                relevance_score += 0.1
-        
-        # Check for industry keywords
-        for keyword in job_desc.industry_keywords:
-            if keyword.lower() in job_text:
-                relevance_score += 0.1
+        # Check for required skills, technology stack and industry keywords in one pass
+        found = job_cache.matcher.find(job_text)
+        relevance_score += JobTermMatcher.weighted_score(found, JOB_RELEVANCE_WEIGHTS)
         
         return min(relevance_score, 1.0)
     
+    def _job_covers_requirements(self, job: EmploymentDetail, job_analysis: JobAnalysisResult) -> bool:
+        """Check whether the job text already mentions enough of the required skills"""
+        job_cache = self._get_job_cache(job_analysis)
+        if not job_cache.required_lower:
+            return False
+        
+        counts = JobTermMatcher.count_categories(job_cache.matcher.find(self._job_text(job)))
+        return counts["required"] / len(job_cache.required_lower) >= JOB_SKIP_SKILL_COVERAGE
+    
+    @staticmethod
+    def _job_text(job: EmploymentDetail) -> str:
+        """Position, description and achievements of a job as one lowercased string"""
+        return f"{job.position} {' '.join(job.description)} {' '.join(job.achievements)}".lower()
+    
+    @staticmethod
+    def _title_similarity(position: str, title: str) -> float:
+        """Similarity ratio (0.0-1.0) between two lowercased job titles"""
+        if RAPIDFUZZ_AVAILABLE:
+            return fuzz.ratio(position, title) / 100.0
+        return SequenceMatcher(None, position, title).ratio()
+    
     def _optimize_job_description(self, job: EmploymentDetail, job_analysis: JobAnalysisResult) -> EmploymentDetail:
         """Optimize individual job description and achievements"""
         system_prompt = """
@@ -346,81 +820,79 @@ class CVOptimizer:
         }
         """
         
-        job_context = f"""
-        Job Title: {job_analysis.job_description.title}
-        Required Skills: {', '.join([s.skill_name for s in job_analysis.job_description.required_skills])}
-        Technology Stack: {', '.join(job_analysis.job_description.technology_stack)}
-        Action Verbs: {', '.join(job_analysis.job_description.keywords)}
-        """
+        job_context = self._employment_job_context(job_analysis)
         
-        current_content = f"""
-        Position: {job.position}
-        Company: {job.company}
-        Current Description: {'; '.join(job.description)}
-        Current Achievements: {'; '.join(job.achievements)}
-        """
+        user_content = "".join([
+            "Job Context:\n", job_context,
+            "\n\nCurrent Job:\n",
+            "Position: ", job.position, "\n",
+            "Company: ", job.company, "\n",
+            "Current Description: ", "; ".join(job.description), "\n",
+            "Current Achievements: ", "; ".join(job.achievements), "\n"
+        ])
+        
+        def parse(content: str) -> Optional[JobRewrite]:
+            try:
+                return JobRewrite.model_validate_json(content)
+            except ValidationError:
+                return None
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            rewrite = self._complete_with_escalation(
                 messages=[
                     {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Job Context:\n{job_context}\n\nCurrent Job:\n{current_content}"}
+                    {"role": "user", "content": user_content}
                 ],
-                temperature=self.temperature,
                 max_tokens=1000,
+                parse=parse,
                 response_format={"type": "json_object"}
             )
-            
-            content = response.choices[0].message.content
-            if content:
-                data = json.loads(content)
-                job.description = data.get("description", job.description)
-                job.achievements = data.get("achievements", job.achievements)
+            if rewrite is not None:
+                self._apply_job_rewrite(job, rewrite)
             
         except Exception as e:
             logger.error(f"Error optimizing job description: {str(e)}")
         
         return job
     
+    @staticmethod
+    def _apply_job_rewrite(job: EmploymentDetail, rewrite: JobRewrite):
+        """Apply an optimized description and achievements to a job"""
+        job.description = rewrite.description
+        job.achievements = rewrite.achievements
+    
     def _optimize_projects(self, projects: List[Project], job_analysis: JobAnalysisResult) -> List[Project]:
         """Optimize projects for the job"""
         if not projects:
             return projects
         
         optimized_projects = []
+        matcher = self._get_job_cache(job_analysis).matcher
         
         for project in projects:
-            # Calculate relevance score
+            # Calculate relevance score from required skills and technology stack
             project_text = f"{project.name} {project.description} {' '.join(project.technologies)}".lower()
-            relevance_score = 0.0
-            
-            # Check for required skills
-            for skill in job_analysis.job_description.required_skills:
-                if skill.skill_name.lower() in project_text:
-                    relevance_score += 0.3
-            
-            # Check for technology stack
-            for tech in job_analysis.job_description.technology_stack:
-                if tech.lower() in project_text:
-                    relevance_score += 0.2
+            found = matcher.find(project_text)
+            relevance_score = JobTermMatcher.weighted_score(found, PROJECT_RELEVANCE_WEIGHTS)
+            project.relevance_score = min(relevance_score, 1.0)
             
             # Only include relevant projects
-            if relevance_score > 0.3:
+            if project.relevance_score > 0.3:
                 optimized_projects.append(project)
         
         # Sort by relevance and limit
         optimized_projects.sort(key=lambda x: x.relevance_score, reverse=True)
         return optimized_projects[:5]  # Limit to 5 most relevant projects
     
-    def _add_missing_skills(self, cv_data: CVData, job_analysis: JobAnalysisResult):
+    def _add_missing_skills(self, cv_data: CVData, job_analysis: JobAnalysisResult, changes: Optional[Set[str]] = None):
         """Add missing but relevant skills to the CV"""
-        existing_skills = cv_data.get_all_skills()
+        cv_ctx = CVTextContext(cv_data)
+        required_lower = self._get_job_cache(job_analysis).required_lower
         missing_skills = []
         
         # Check for missing required skills
-        for skill_req in job_analysis.job_description.required_skills:
-            if not any(skill_req.skill_name.lower() in existing.lower() for existing in existing_skills):
+        for skill_req, skill_lower in zip(job_analysis.job_description.required_skills, required_lower):
+            if not cv_ctx.has_skill(skill_lower):
                 missing_skills.append(skill_req)
         
         # Add missing skills with appropriate proficiency levels
@@ -433,131 +905,94 @@ class CVOptimizer:
                 keywords=[skill_req.skill_name]
             )
             cv_data.add_skill(new_skill)
+            if new_skill.category == "technical" and changes is not None:
+                changes.add("technical_skills_added")
     
-    def _optimize_keywords(self, cv_data: CVData, job_analysis: JobAnalysisResult):
+    def _optimize_keywords(self, cv_data: CVData, job_analysis: JobAnalysisResult, cv_ctx: Optional[CVTextContext] = None):
         """Optimize keyword distribution throughout the CV"""
         # This would implement keyword density optimization
         # For now, we'll just track keyword matches
+        cv_ctx = cv_ctx or CVTextContext(cv_data)
         job_keywords = job_analysis.job_description.keywords
-        cv_text = f"{cv_data.summary} {' '.join(cv_data.get_all_skills())}"
+        job_cache = self._get_job_cache(job_analysis)
+        
+        # Count every keyword in a single pass over the CV text
+        counts = job_cache.matcher.count(cv_ctx.combined_lower)
         
         keyword_matches = {}
-        for keyword in job_keywords:
-            count = cv_text.lower().count(keyword.lower())
+        for keyword, keyword_lower in zip(job_keywords, job_cache.keywords_lower):
+            count = counts.get(keyword_lower, 0)
             if count > 0:
                 keyword_matches[keyword] = count
         
         cv_data.keyword_matches = keyword_matches
     
-    def _calculate_optimization_score(self, cv_data: CVData, job_analysis: JobAnalysisResult) -> float:
+    def _calculate_optimization_score(self, cv_data: CVData, job_analysis: JobAnalysisResult, cv_ctx: Optional[CVTextContext] = None) -> float:
         """Calculate overall optimization score"""
-        score = 0.0
-        
-        # Skill match score (40% weight)
-        skill_score = self._calculate_skill_match_score(cv_data, job_analysis)
-        score += skill_score * 0.4
-        
-        # Experience relevance score (30% weight)
-        experience_score = self._calculate_experience_relevance_score(cv_data, job_analysis)
-        score += experience_score * 0.3
+        skill_score, experience_score, keyword_score, summary_score = self._score_all(cv_data, job_analysis, cv_ctx)
         
-        # Keyword match score (20% weight)
-        keyword_score = self._calculate_keyword_match_score(cv_data, job_analysis)
-        score += keyword_score * 0.2
-        
-        # Summary optimization score (10% weight)
-        summary_score = self._calculate_summary_optimization_score(cv_data, job_analysis)
-        score += summary_score * 0.1
+        # Skill match 40%, experience relevance 30%, keyword match 20%, summary 10%
+        score = skill_score * 0.4 + experience_score * 0.3 + keyword_score * 0.2 + summary_score * 0.1
         
         return min(score, 100.0)
     
-    def _calculate_skill_match_score(self, cv_data: CVData, job_analysis: JobAnalysisResult) -> float:
-        """Calculate skill match score"""
-        required_skills = job_analysis.job_description.required_skills
-        cv_skills = cv_data.get_all_skills()
-        
-        if not required_skills:
-            return 100.0
-        
-        matched_skills = 0
-        for skill_req in required_skills:
-            if any(skill_req.skill_name.lower() in cv_skill.lower() for cv_skill in cv_skills):
-                matched_skills += 1
-        
-        return (matched_skills / len(required_skills)) * 100
-    
-    def _calculate_experience_relevance_score(self, cv_data: CVData, job_analysis: JobAnalysisResult) -> float:
-        """Calculate experience relevance score"""
-        if not cv_data.employment_history:
-            return 0.0
-        
-        total_relevance = sum(job.relevance_score for job in cv_data.employment_history)
-        avg_relevance = total_relevance / len(cv_data.employment_history)
-        
-        return avg_relevance * 100
-    
-    def _calculate_keyword_match_score(self, cv_data: CVData, job_analysis: JobAnalysisResult) -> float:
-        """Calculate keyword match score"""
-        job_keywords = job_analysis.job_description.keywords
-        if not job_keywords:
-            return 100.0
-        
-        cv_text = f"{cv_data.summary} {' '.join(cv_data.get_all_skills())}".lower()
-        matched_keywords = 0
-        
-        for keyword in job_keywords:
-            if keyword.lower() in cv_text:
-                matched_keywords += 1
-        
-        return (matched_keywords / len(job_keywords)) * 100
-    
-    def _calculate_summary_optimization_score(self, cv_data: CVData, job_analysis: JobAnalysisResult) -> float:
-        """Calculate summary optimization score"""
+    def _score_all(self, cv_data: CVData, job_analysis: JobAnalysisResult,
+                   cv_ctx: Optional[CVTextContext] = None) -> Tuple[float, float, float, float]:
+        """Compute skill, experience, keyword and summary scores in one pass over the CV"""
+        job_cache = self._get_job_cache(job_analysis)
+        cv_ctx = cv_ctx or CVTextContext(cv_data)
+        
+        # Skill match: required skills contained in a CV skill name
+        required_skills = job_cache.required_lower
+        if required_skills:
+            matched_skills = sum(1 for skill_lower in required_skills if cv_ctx.has_skill(skill_lower))
+            skill_score = (matched_skills / len(required_skills)) * 100
+        else:
+            skill_score = 100.0
+        
+        # Experience relevance: average job relevance
+        employment_history = cv_data.employment_history
+        if employment_history:
+            total_relevance = sum(job.relevance_score for job in employment_history)
+            experience_score = (total_relevance / len(employment_history)) * 100
+        else:
+            experience_score = 0.0
+        
+        # The combined text starts with the summary, so one scan yields both match sets
+        found, summary_found = job_cache.matcher.find_with_prefix(cv_ctx.combined_lower, len(cv_ctx.summary_lower))
+        
+        # Keyword match over summary and skills
+        job_keywords = job_cache.keywords_lower
+        if job_keywords:
+            keyword_score = (JobTermMatcher.count_categories(found)["keyword"] / len(job_keywords)) * 100
+        else:
+            keyword_score = 100.0
+        
+        # Summary optimization: keywords and required skills mentioned in the summary
         if not cv_data.summary:
-            return 0.0
-        
-        summary_lower = cv_data.summary.lower()
-        job_keywords = job_analysis.job_description.keywords
-        required_skills = [s.skill_name for s in job_analysis.job_description.required_skills]
-        
-        keyword_matches = sum(1 for keyword in job_keywords if keyword.lower() in summary_lower)
-        skill_matches = sum(1 for skill in required_skills if skill.lower() in summary_lower)
-        
-        total_expected = len(job_keywords) + len(required_skills)
-        if total_expected == 0:
-            return 100.0
-        
-        return ((keyword_matches + skill_matches) / total_expected) * 100
+            summary_score = 0.0
+        else:
+            total_expected = len(job_keywords) + len(required_skills)
+            if total_expected == 0:
+                summary_score = 100.0
+            else:
+                counts = JobTermMatcher.count_categories(summary_found)
+                summary_score = ((counts["keyword"] + counts["required"]) / total_expected) * 100
+        
+        return skill_score, experience_score, keyword_score, summary_score
     
-    def _generate_improvements_list(self, original_cv: CVData, optimized_cv: CVData, job_analysis: JobAnalysisResult) -> List[str]:
-        """Generate list of improvements made"""
-        improvements = []
-        
-        # Summary improvements
-        if original_cv.summary != optimized_cv.summary:
-            improvements.append("Professional summary optimized for job requirements")
-        
-        # Skill improvements
-        if len(optimized_cv.technical_skills) > len(original_cv.technical_skills):
-            improvements.append("Added missing technical skills")
-        
-        # Experience improvements
-        if optimized_cv.employment_history != original_cv.employment_history:
-            improvements.append("Job descriptions enhanced with relevant keywords and achievements")
-        
-        # Keyword improvements
-        if optimized_cv.keyword_matches:
-            improvements.append("Improved keyword distribution for ATS optimization")
-        
-        return improvements
+    def _generate_improvements_list(self, changes: Set[str]) -> List[str]:
+        """Generate list of improvements made from the recorded change tags"""
+        return [message for tag, message in IMPROVEMENT_MESSAGES.items() if tag in changes]
     
-    def _identify_skill_gaps(self, cv_data: CVData, job_analysis: JobAnalysisResult) -> List[str]:
+    def _identify_skill_gaps(self, cv_data: CVData, job_analysis: JobAnalysisResult, cv_ctx: Optional[CVTextContext] = None) -> List[str]:
         """Identify remaining skill gaps"""
-        cv_skills = cv_data.get_all_skills()
+        cv_ctx = cv_ctx or CVTextContext(cv_data)
+        required_lower = self._get_job_cache(job_analysis).required_lower
         skill_gaps = []
         
-        for skill_req in job_analysis.job_description.required_skills:
-            if not any(skill_req.skill_name.lower() in cv_skill.lower() for cv_skill in cv_skills):
+        for skill_req, skill_lower in zip(job_analysis.job_description.required_skills, required_lower):
+            if not cv_ctx.has_skill(skill_lower):
                 skill_gaps.append(skill_req.skill_name)
         
         return skill_gaps
@@ -2,13 +2,37 @@
 Job description analyzer for the smart CV writer service
 """
 import re
-import json
+import time
+import asyncio
+import hashlib
 import logging
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, OpenAI
 
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from ..utils.analysis_cache import ExtractionCache
+from ..utils.fast_json import json_dumps, json_loads
+from ..utils.rate_limiter import RateLimiter, estimate_request_tokens
 from ..models.job_data import (
     JobDescription, JobRequirement, SkillRequirement, ExperienceRequirement,
     EducationRequirement, CompanyInfo, JobAnalysisResult, JobMarketData
@@ -16,268 +40,593 @@ from ..models.job_data import (
 
 logger = logging.getLogger(__name__)
 
+# Keep connections warm across request bursts instead of paying a TLS handshake per call
+OPENAI_HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+OPENAI_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+JOB_DATA_SCHEMA = """{
+  "title": "Job title",
+  "company": {
+    "name": "Company name",
+    "industry": "Industry",
+    "size": "Company size (startup/small/medium/large/enterprise)",
+    "location": "Location",
+    "remote_policy": "Remote policy",
+    "culture_keywords": ["culture", "keywords"],
+    "tech_stack": ["tech", "stack"]
+  },
+  "location": "Job location",
+  "employment_type": "Employment type",
+  "experience_level": "Experience level",
+  "salary_range": "Salary range",
+  "description": "Full description",
+  "required_skills": [
+    {
+      "skill_name": "Skill name",
+      "category": "technical/soft/tool/certification",
+      "level": "beginner/intermediate/advanced/expert",
+      "years_experience": null,
+      "required": true,
+      "alternatives": [],
+      "industry_specific": false
+    }
+  ],
+  "preferred_skills": [...],
+  "experience_requirements": {
+    "years_required": 0,
+    "role_type": "Role type",
+    "relevant_positions": [],
+    "industry_preference": [],
+    "project_scale": ""
+  },
+  "education_requirements": {
+    "degree_level": "Degree level",
+    "field_of_study": [],
+    "required": true,
+    "equivalent_experience": false,
+    "certifications_accepted": []
+  },
+  "responsibilities": ["Responsibility 1", "Responsibility 2"],
+  "duties": ["Duty 1", "Duty 2"],
+  "benefits": ["Benefit 1", "Benefit 2"],
+  "perks": ["Perk 1", "Perk 2"],
+  "keywords": ["keyword1", "keyword2"],
+  "industry_keywords": ["industry", "keywords"],
+  "technology_stack": ["tech1", "tech2"],
+  "methodologies": ["agile", "scrum"]
+}"""
+
+REQUIREMENT_SCHEMA = """{
+  "text": "Requirement text",
+  "category": "required/preferred/bonus/nice_to_have",
+  "importance": 0.0-1.0,
+  "keywords": ["keyword1", "keyword2"],
+  "synonyms": ["synonym1", "synonym2"],
+  "industry_context": "Industry context"
+}"""
+
+
+EMERGING_TECH = ["AI", "Machine Learning", "Blockchain", "IoT", "Edge Computing"]
+# Matched against the lowercased description
+EMERGING_TECH_RE = re.compile(r"\b(" + "|".join(re.escape(tech.lower()) for tech in EMERGING_TECH) + r")\b")
+
+# Common action verbs in job descriptions; a leading word boundary still matches inflections like "developing"
+ACTION_VERBS = [
+    "develop", "design", "implement", "manage", "lead", "create",
+    "build", "maintain", "optimize", "analyze", "improve", "deliver",
+    "coordinate", "collaborate", "communicate", "solve", "innovate"
+]
+ACTION_VERB_RE = re.compile(r"\b(" + "|".join(map(re.escape, ACTION_VERBS)) + r")")
+
+# Culture signals in the lowercased benefits and perks, matched anywhere in a word (e.g. "healthcare")
+CULTURE_SIGNALS = {
+    "flexible": ["flexible", "remote"],
+    "healthcare": ["health", "insurance"],
+    "equity": ["equity", "stock"]
+}
+CULTURE_SIGNAL_RE = re.compile(
+    "|".join(f"(?P<{signal}>{'|'.join(map(re.escape, terms))})" for signal, terms in CULTURE_SIGNALS.items())
+)
+if AHOCORASICK_AVAILABLE:
+    # Single pass over the text however large the taxonomy grows
+    CULTURE_SIGNAL_AUTOMATON = ahocorasick.Automaton()
+    for signal, terms in CULTURE_SIGNALS.items():
+        for term in terms:
+            CULTURE_SIGNAL_AUTOMATON.add_word(term, signal)
+    CULTURE_SIGNAL_AUTOMATON.make_automaton()
+
+# Batch statuses after which the batch will not make further progress
+BATCH_FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+JOB_DATA_PROMPT = """
+        You are an expert job description analyzer. Extract structured information from the provided job description.
+        
+        Return the analysis as a JSON object with the following structure:
+        """ + JOB_DATA_SCHEMA + """
+        
+        Be precise and extract only what is explicitly stated. Use null for missing information.
+        """
+
+REQUIREMENTS_PROMPT = """
+        Extract individual requirements from the job description. Each requirement should be categorized and scored for importance.
+        
+        Report them by calling emit_requirements.
+        """
+
+# Function schema for requirement extraction; the API validates the arguments against it
+REQUIREMENTS_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "emit_requirements",
+        "description": "Report the individual requirements found in the job description",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "items": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "text": {"type": "string"},
+                            "category": {"type": "string", "enum": ["required", "preferred", "bonus", "nice_to_have"]},
+                            "importance": {"type": "number", "minimum": 0.0, "maximum": 1.0},
+                            "keywords": {"type": "array", "items": {"type": "string"}},
+                            "synonyms": {"type": "array", "items": {"type": "string"}},
+                            "industry_context": {"type": "string"}
+                        },
+                        "required": ["text", "category", "importance"]
+                    }
+                }
+            },
+            "required": ["items"]
+        }
+    }
+}
+
+EXTRACT_ALL_PROMPT = """
+        You are an expert job description analyzer. Extract structured information and individual requirements from the provided job description.
+        
+        Return the analysis as a JSON object with the following structure:
+        {
+          "job_description": """ + JOB_DATA_SCHEMA + """,
+          "requirements": [
+            """ + REQUIREMENT_SCHEMA + """
+          ]
+        }
+        
+        Categorize each requirement and score it for importance.
+        Be precise and extract only what is explicitly stated. Use null for missing information.
+        """
+
+
+class StreamedJSONObject:
+    """Parses a JSON object as it streams in, collecting top-level members as each one completes"""
+    
+    def __init__(self):
+        self._events = ijson.sendable_list()
+        self._parser = ijson.kvitems_coro(self._events, "", use_float=True)
+        self.data: Dict[str, Any] = {}
+    
+    def feed(self, chunk: str):
+        """Parse the next piece of the response"""
+        self._parser.send(chunk.encode("utf-8"))
+        self._collect()
+    
+    def close(self) -> Dict[str, Any]:
+        """Finish parsing, raising if the JSON was incomplete, and return the object"""
+        self._parser.close()
+        self._collect()
+        if not self.data:
+            raise ValueError("Empty response from OpenAI")
+        return self.data
+    
+    def _collect(self):
+        for key, value in self._events:
+            self.data[key] = value
+        del self._events[:]
+
 
 class JobAnalyzer:
     """Analyzes job descriptions to extract requirements and insights"""
     
-    def __init__(self, api_key: str, model: str = "gpt-4-turbo", temperature: float = 0.1):
+    def __init__(self, api_key: str, model: str = "gpt-4-turbo", cheap_model: str = "gpt-4o-mini",
+                 temperature: float = 0.1, cache_size: int = 1024, semantic_cache: bool = False,
+                 max_requests_per_minute: int = 500, max_tokens_per_minute: int = 150000):
         self.api_key = api_key
         self.model = model
+        # Narrow, schema-bound extractions don't need the frontier model
+        self.cheap_model = cheap_model
         self.temperature = temperature
-        self.client = OpenAI(api_key=api_key)
+        self.client = OpenAI(
+            api_key=api_key,
+            http_client=httpx.Client(http2=HTTP2_AVAILABLE, limits=OPENAI_HTTP_LIMITS, timeout=OPENAI_HTTP_TIMEOUT)
+        )
+        self.aclient = AsyncOpenAI(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=OPENAI_HTTP_LIMITS, timeout=OPENAI_HTTP_TIMEOUT)
+        )
+        # Extraction results by job text; near-duplicate lookups cost one embedding request
+        self.extraction_cache = ExtractionCache(
+            maxsize=cache_size,
+            embed=self.embed_job_text if semantic_cache else None
+        )
+        # Pace requests below the account limits instead of running into 429 backoff
+        self.rate_limiter = RateLimiter(max_requests_per_minute, max_tokens_per_minute)
+        # (text digest, result) of the most recent analysis, for clients that resubmit unchanged text;
+        # the result object is returned as-is, so callers must treat it as read-only
+        self._last_analysis: Optional[Tuple[bytes, JobAnalysisResult]] = None
         
     def analyze_job_description(self, job_text: str) -> JobAnalysisResult:
         """Analyze a job description and extract structured information"""
         start_time = datetime.now()
         
+        if not job_text or not job_text.strip():
+            return self._empty_analysis_result()
+        
+        digest = self._text_digest(job_text)
+        last_analysis = self._last_analysis
+        if last_analysis is not None and last_analysis[0] == digest:
+            return last_analysis[1]
+        
         try:
-            # Extract structured job data
-            job_description = self._extract_job_data(job_text)
-            
-            # Extract requirements
-            requirements = self._extract_requirements(job_text, job_description)
+            # Extract structured job data and requirements in one request
+            extracted = self.extraction_cache.get(job_text)
+            if extracted is None:
+                extracted = self._extract_all(job_text)
+                self.extraction_cache.put(job_text, extracted)
+            job_description, requirements = extracted
             
-            # Analyze skill gaps and insights
-            skill_gaps = self._identify_skill_gaps(job_description)
-            industry_insights = self._analyze_industry_context(job_description)
-            company_culture = self._analyze_company_culture(job_description)
-            salary_benchmarks = self._get_salary_benchmarks(job_description)
-            
-            # Generate suggestions
-            suggestions = self._generate_suggestions(job_description, skill_gaps)
-            
-            processing_time = (datetime.now() - start_time).total_seconds()
-            
-            return JobAnalysisResult(
-                job_description=job_description,
-                extracted_requirements=requirements,
-                skill_gaps=skill_gaps,
-                industry_insights=industry_insights,
-                company_culture=company_culture,
-                salary_benchmarks=salary_benchmarks,
-                processing_time=processing_time,
-                confidence_score=0.85,  # TODO: Implement confidence scoring
-                suggestions=suggestions
-            )
+            result = self._build_analysis_result(job_description, requirements, start_time)
+            self._last_analysis = (digest, result)
+            return result
             
         except Exception as e:
             logger.error(f"Error analyzing job description: {str(e)}")
             raise
     
-    def _extract_job_data(self, job_text: str) -> JobDescription:
-        """Extract structured job data from text"""
-        system_prompt = """
-        You are an expert job description analyzer. Extract structured information from the provided job description.
+    async def analyze_job_description_async(self, job_text: str) -> JobAnalysisResult:
+        """Analyze a job description without blocking, extracting job data and requirements concurrently"""
+        start_time = datetime.now()
         
-        Return the analysis as a JSON object with the following structure:
-        {
-          "title": "Job title",
-          "company": {
-            "name": "Company name",
-            "industry": "Industry",
-            "size": "Company size (startup/small/medium/large/enterprise)",
-            "location": "Location",
-            "remote_policy": "Remote policy",
-            "culture_keywords": ["culture", "keywords"],
-            "tech_stack": ["tech", "stack"]
-          },
-          "location": "Job location",
-          "employment_type": "Employment type",
-          "experience_level": "Experience level",
-          "salary_range": "Salary range",
-          "description": "Full description",
-          "required_skills": [
-            {
-              "skill_name": "Skill name",
-              "category": "technical/soft/tool/certification",
-              "level": "beginner/intermediate/advanced/expert",
-              "years_experience": null,
-              "required": true,
-              "alternatives": [],
-              "industry_specific": false
-            }
-          ],
-          "preferred_skills": [...],
-          "experience_requirements": {
-            "years_required": 0,
-            "role_type": "Role type",
-            "relevant_positions": [],
-            "industry_preference": [],
-            "project_scale": ""
-          },
-          "education_requirements": {
-            "degree_level": "Degree level",
-            "field_of_study": [],
-            "required": true,
-            "equivalent_experience": false,
-            "certifications_accepted": []
-          },
-          "responsibilities": ["Responsibility 1", "Responsibility 2"],
-          "duties": ["Duty 1", "Duty 2"],
-          "benefits": ["Benefit 1", "Benefit 2"],
-          "perks": ["Perk 1", "Perk 2"],
-          "keywords": ["keyword1", "keyword2"],
-          "industry_keywords": ["industry", "keywords"],
-          "technology_stack": ["tech1", "tech2"],
-          "methodologies": ["agile", "scrum"]
-        }
+        if not job_text or not job_text.strip():
+            return self._empty_analysis_result()
         
-        Be precise and extract only what is explicitly stated. Use null for missing information.
-        """
+        digest = self._text_digest(job_text)
+        last_analysis = self._last_analysis
+        if last_analysis is not None and last_analysis[0] == digest:
+            return last_analysis[1]
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": job_text}
-                ],
-                temperature=self.temperature,
-                max_tokens=4000,
-                response_format={"type": "json_object"}
-            )
-            
-            content = response.choices[0].message.content
-            if not content:
-                raise ValueError("Empty response from OpenAI")
+            # The semantic cache makes a blocking embedding request
+            if self.extraction_cache.semantic:
+                extracted = await asyncio.to_thread(self.extraction_cache.get, job_text)
+            else:
+                extracted = self.extraction_cache.get(job_text)
             
-            data = json.loads(content)
+            if extracted is None:
+                extracted = await asyncio.gather(
+                    self._extract_job_data_async(job_text),
+                    self._extract_requirements_async(job_text)
+                )
+                self.extraction_cache.put(job_text, tuple(extracted))
+            job_description, requirements = extracted
             
-            # Build JobDescription object
-            company_info = CompanyInfo(
-                name=data.get("company", {}).get("name", ""),
-                industry=data.get("company", {}).get("industry", ""),
-                size=data.get("company", {}).get("size", ""),
-                location=data.get("company", {}).get("location", ""),
-                remote_policy=data.get("company", {}).get("remote_policy", ""),
-                culture_keywords=data.get("company", {}).get("culture_keywords", []),
-                tech_stack=data.get("company", {}).get("tech_stack", [])
-            )
+            result = self._build_analysis_result(job_description, requirements, start_time)
+            self._last_analysis = (digest, result)
+            return result
             
-            # Build skill requirements
-            required_skills = []
-            for skill_data in data.get("required_skills", []):
-                required_skills.append(SkillRequirement(
-                    skill_name=skill_data.get("skill_name", ""),
-                    category=skill_data.get("category", "technical"),
-                    level=skill_data.get("level", "intermediate"),
-                    years_experience=skill_data.get("years_experience"),
-                    required=skill_data.get("required", True),
-                    alternatives=skill_data.get("alternatives", []),
-                    industry_specific=skill_data.get("industry_specific", False)
-                ))
-            
-            preferred_skills = []
-            for skill_data in data.get("preferred_skills", []):
-                preferred_skills.append(SkillRequirement(
-                    skill_name=skill_data.get("skill_name", ""),
-                    category=skill_data.get("category", "technical"),
-                    level=skill_data.get("level", "intermediate"),
-                    years_experience=skill_data.get("years_experience"),
-                    required=False,
-                    alternatives=skill_data.get("alternatives", []),
-                    industry_specific=skill_data.get("industry_specific", False)
-                ))
-            
-            # Build experience requirements
-            exp_req_data = data.get("experience_requirements", {})
-            experience_requirements = ExperienceRequirement(
-                years_required=exp_req_data.get("years_required", 0),
-                role_type=exp_req_data.get("role_type", ""),
-                relevant_positions=exp_req_data.get("relevant_positions", []),
-                industry_preference=exp_req_data.get("industry_preference", []),
-                project_scale=exp_req_data.get("project_scale", "")
-            )
+        except Exception as e:
+            logger.error(f"Error analyzing job description: {str(e)}")
+            raise
+    
+    @staticmethod
+    def _text_digest(job_text: str) -> bytes:
+        """Short digest identifying a job text"""
+        return hashlib.blake2b(job_text.encode("utf-8"), digest_size=16).digest()
+    
+    @staticmethod
+    def _empty_analysis_result() -> JobAnalysisResult:
+        """Result for a blank job description, produced without any API calls"""
+        return JobAnalysisResult(
+            job_description=JobDescription(
+                experience_requirements=ExperienceRequirement(years_required=0, role_type=""),
+                education_requirements=EducationRequirement(degree_level="")
+            ),
+            extracted_requirements=[],
+            processing_time=0.0,
+            confidence_score=0.0
+        )
+    
+    def _build_analysis_result(self, job_description: JobDescription, requirements: List[JobRequirement],
+                               start_time: datetime) -> JobAnalysisResult:
+        """Wrap the extracted job data; skill gaps, insights and suggestions are computed on first access"""
+        processing_time = (datetime.now() - start_time).total_seconds()
+        
+        return JobAnalysisResult(
+            job_description=job_description,
+            extracted_requirements=requirements,
+            processing_time=processing_time,
+            confidence_score=0.85,  # TODO: Implement confidence scoring
+            analyzer=self
+        )
+    
+    def submit_batch_analysis(self, job_texts: List[str]) -> str:
+        """Submit job descriptions to the OpenAI Batch API, returning the batch ID"""
+        lines = [
+            json_dumps({
+                "custom_id": str(idx),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._completion_request(EXTRACT_ALL_PROMPT, job_text, max_tokens=4096)
+            })
+            for idx, job_text in enumerate(job_texts)
+        ]
+        
+        input_file = self.client.files.create(
+            file=("job_analysis_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        
+        logger.info(f"Submitted batch {batch.id} with {len(job_texts)} job descriptions")
+        return batch.id
+    
+    def collect_batch_analysis(self, batch_id: str, job_count: int,
+                               poll_interval: float = 30.0) -> List[Optional[JobAnalysisResult]]:
+        """Wait for a submitted batch and build one result per job (None where its request failed)"""
+        start_time = datetime.now()
+        
+        batch = self.client.batches.retrieve(batch_id)
+        while batch.status not in BATCH_FINAL_STATUSES:
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch_id)
+        
+        if not batch.output_file_id:
+            raise RuntimeError(f"Batch {batch_id} finished with status {batch.status} and no output")
+        
+        results: List[Optional[JobAnalysisResult]] = [None] * job_count
+        output = self.client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
             
-            # Build education requirements
-            edu_req_data = data.get("education_requirements", {})
-            education_requirements = EducationRequirement(
-                degree_level=edu_req_data.get("degree_level", ""),
-                field_of_study=edu_req_data.get("field_of_study", []),
-                required=edu_req_data.get("required", True),
-                equivalent_experience=edu_req_data.get("equivalent_experience", False),
-                certifications_accepted=edu_req_data.get("certifications_accepted", [])
-            )
+            entry = json_loads(line)
+            idx = int(entry["custom_id"])
+            response = entry.get("response") or {}
+            if entry.get("error") or response.get("status_code") != 200:
+                logger.error(f"Batch request {idx} failed: {entry.get('error') or response.get('status_code')}")
+                continue
             
-            return JobDescription(
-                title=data.get("title", ""),
-                company=company_info,
-                location=data.get("location", ""),
-                employment_type=data.get("employment_type", ""),
-                experience_level=data.get("experience_level", ""),
-                salary_range=data.get("salary_range", ""),
-                description=data.get("description", ""),
-                required_skills=required_skills,
-                preferred_skills=preferred_skills,
-                experience_requirements=experience_requirements,
-                education_requirements=education_requirements,
-                responsibilities=data.get("responsibilities", []),
-                duties=data.get("duties", []),
-                benefits=data.get("benefits", []),
-                perks=data.get("perks", []),
-                keywords=data.get("keywords", []),
-                industry_keywords=data.get("industry_keywords", []),
-                technology_stack=data.get("technology_stack", []),
-                methodologies=data.get("methodologies", [])
-            )
+            try:
+                content = response["body"]["choices"][0]["message"]["content"]
+                job_description, requirements = self._parse_extract_all(content)
+                results[idx] = self._build_analysis_result(job_description, requirements, start_time)
+            except Exception as e:
+                logger.error(f"Error analyzing batch job description {idx}: {str(e)}")
+        
+        return results
+    
+    def analyze_job_descriptions_batch(self, job_texts: List[str],
+                                       poll_interval: float = 30.0) -> List[Optional[JobAnalysisResult]]:
+        """Analyze many job descriptions through the Batch API (half price, completes within 24h)"""
+        if not job_texts:
+            return []
+        
+        batch_id = self.submit_batch_analysis(job_texts)
+        return self.collect_batch_analysis(batch_id, len(job_texts), poll_interval)
+    
+    def embed_job_text(self, job_text: str) -> List[float]:
+        """Embed a job description for semantic cache lookups"""
+        self.rate_limiter.acquire(len(job_text) // 4)
+        response = self.client.embeddings.create(model="text-embedding-3-small", input=job_text)
+        return response.data[0].embedding
+    
+    def _completion_request(self, system_prompt: str, job_text: str, max_tokens: int,
+                            model: Optional[str] = None) -> Dict[str, Any]:
+        """Build the chat completion arguments for an extraction request (defaults to the main model)"""
+        return {
+            "model": model or self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": job_text}
+            ],
+            "temperature": self.temperature,
+            "max_tokens": max_tokens,
+            "response_format": {"type": "json_object"}
+        }
+    
+    def _requirements_request(self, job_text: str) -> Dict[str, Any]:
+        """Build the chat completion arguments for requirement extraction through emit_requirements"""
+        request = self._completion_request(REQUIREMENTS_PROMPT, job_text, max_tokens=2000, model=self.cheap_model)
+        del request["response_format"]
+        request["tools"] = [REQUIREMENTS_TOOL]
+        request["tool_choice"] = {"type": "function", "function": {"name": "emit_requirements"}}
+        return request
+    
+    def _extract_all(self, job_text: str) -> Tuple[JobDescription, List[JobRequirement]]:
+        """Extract structured job data and individual requirements with a single request"""
+        try:
+            request = self._completion_request(EXTRACT_ALL_PROMPT, job_text, max_tokens=4096)
+            self.rate_limiter.acquire(estimate_request_tokens(request))
+            response = self.client.chat.completions.create(**request)
+            return self._parse_extract_all(response.choices[0].message.content)
             
         except Exception as e:
             logger.error(f"Error extracting job data: {str(e)}")
             raise
     
-    def _extract_requirements(self, job_text: str, job_description: JobDescription) -> List[JobRequirement]:
-        """Extract individual requirements from job description"""
-        system_prompt = """
-        Extract individual requirements from the job description. Each requirement should be categorized and scored for importance.
+    def _parse_extract_all(self, content: Optional[str]) -> Tuple[JobDescription, List[JobRequirement]]:
+        """Parse a combined job data and requirements response"""
+        if not content:
+            raise ValueError("Empty response from OpenAI")
         
-        Return as JSON array:
-        [
-          {
-            "text": "Requirement text",
-            "category": "required/preferred/bonus/nice_to_have",
-            "importance": 0.0-1.0,
-            "keywords": ["keyword1", "keyword2"],
-            "synonyms": ["synonym1", "synonym2"],
-            "industry_context": "Industry context"
-          }
-        ]
-        """
+        data = json_loads(content)
+        job_data = data.get("job_description")
+        if not isinstance(job_data, dict):
+            raise ValueError("Response is missing job_description")
+        
+        job_description = self._build_job_description(job_data)
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": job_text}
-                ],
-                temperature=self.temperature,
-                max_tokens=2000,
-                response_format={"type": "json_object"}
-            )
-            
-            content = response.choices[0].message.content
-            if not content:
-                return []
-            
-            data = json.loads(content)
+            requirements = self._build_requirements(data.get("requirements") or [])
+        except Exception as e:
+            logger.error(f"Error extracting requirements: {str(e)}")
             requirements = []
+        
+        return job_description, requirements
+    
+    async def _extract_job_data_async(self, job_text: str) -> JobDescription:
+        """Extract structured job data from text without blocking"""
+        try:
+            request = self._completion_request(JOB_DATA_PROMPT, job_text, max_tokens=4000)
+            await self.rate_limiter.acquire_async(estimate_request_tokens(request))
+            
+            if IJSON_AVAILABLE:
+                # Parse the response while it streams in
+                parser = StreamedJSONObject()
+                async for chunk in await self.aclient.chat.completions.create(**request, stream=True):
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parser.feed(chunk.choices[0].delta.content)
+                return self._build_job_description(parser.close())
             
-            for req_data in data:
-                requirements.append(JobRequirement(
-                    text=req_data.get("text", ""),
-                    category=req_data.get("category", "required"),
-                    importance=req_data.get("importance", 0.5),
-                    keywords=req_data.get("keywords", []),
-                    synonyms=req_data.get("synonyms", []),
-                    industry_context=req_data.get("industry_context", "")
-                ))
+            response = await self.aclient.chat.completions.create(**request)
+            return self._parse_job_data(response.choices[0].message.content)
             
-            return requirements
+        except Exception as e:
+            logger.error(f"Error extracting job data: {str(e)}")
+            raise
+    
+    def _parse_job_data(self, content: Optional[str]) -> JobDescription:
+        """Parse a job data extraction response"""
+        if not content:
+            raise ValueError("Empty response from OpenAI")
+        
+        return self._build_job_description(json_loads(content))
+    
+    async def _extract_requirements_async(self, job_text: str) -> List[JobRequirement]:
+        """Extract individual requirements from job description without blocking"""
+        try:
+            request = self._requirements_request(job_text)
+            await self.rate_limiter.acquire_async(estimate_request_tokens(request))
+            response = await self.aclient.chat.completions.create(**request)
+            return self._parse_requirements(response.choices[0].message)
             
         except Exception as e:
             logger.error(f"Error extracting requirements: {str(e)}")
             return []
     
+    def _parse_requirements(self, message: Any) -> List[JobRequirement]:
+        """Parse the emit_requirements call of a requirements extraction response"""
+        for tool_call in message.tool_calls or []:
+            if tool_call.function.name == "emit_requirements":
+                arguments = json_loads(tool_call.function.arguments)
+                return self._build_requirements(arguments.get("items") or [])
+        return []
+    
+    @staticmethod
+    def _build_job_description(data: Dict[str, Any]) -> JobDescription:
+        """Build a JobDescription from the extracted job data"""
+        # Build company info
+        company_info = CompanyInfo(
+            name=data.get("company", {}).get("name", ""),
+            industry=data.get("company", {}).get("industry", ""),
+            size=data.get("company", {}).get("size", ""),
+            location=data.get("company", {}).get("location", ""),
+            remote_policy=data.get("company", {}).get("remote_policy", ""),
+            culture_keywords=data.get("company", {}).get("culture_keywords", []),
+            tech_stack=data.get("company", {}).get("tech_stack", [])
+        )
+        
+        # Build skill requirements
+        required_skills = []
+        for skill_data in data.get("required_skills", []):
+            required_skills.append(SkillRequirement(
+                skill_name=skill_data.get("skill_name", ""),
+                category=skill_data.get("category", "technical"),
+                level=skill_data.get("level", "intermediate"),
+                years_experience=skill_data.get("years_experience"),
+                required=skill_data.get("required", True),
+                alternatives=skill_data.get("alternatives", []),
+                industry_specific=skill_data.get("industry_specific", False)
+            ))
+        
+        preferred_skills = []
+        for skill_data in data.get("preferred_skills", []):
+            preferred_skills.append(SkillRequirement(
+                skill_name=skill_data.get("skill_name", ""),
+                category=skill_data.get("category", "technical"),
+                level=skill_data.get("level", "intermediate"),
+                years_experience=skill_data.get("years_experience"),
+                required=False,
+                alternatives=skill_data.get("alternatives", []),
+                industry_specific=skill_data.get("industry_specific", False)
+            ))
+        
+        # Build experience requirements
+        exp_req_data = data.get("experience_requirements", {})
+        experience_requirements = ExperienceRequirement(
+            years_required=exp_req_data.get("years_required", 0),
+            role_type=exp_req_data.get("role_type", ""),
+            relevant_positions=exp_req_data.get("relevant_positions", []),
+            industry_preference=exp_req_data.get("industry_preference", []),
+            project_scale=exp_req_data.get("project_scale", "")
+        )
+        
+        # Build education requirements
+        edu_req_data = data.get("education_requirements", {})
+        education_requirements = EducationRequirement(
+            degree_level=edu_req_data.get("degree_level", ""),
+            field_of_study=edu_req_data.get("field_of_study", []),
+            required=edu_req_data.get("required", True),
+            equivalent_experience=edu_req_data.get("equivalent_experience", False),
+            certifications_accepted=edu_req_data.get("certifications_accepted", [])
+        )
+        
+        return JobDescription(
+            title=data.get("title", ""),
+            company=company_info,
+            location=data.get("location", ""),
+            employment_type=data.get("employment_type", ""),
+            experience_level=data.get("experience_level", ""),
+            salary_range=data.get("salary_range", ""),
+            description=data.get("description", ""),
+            required_skills=required_skills,
+            preferred_skills=preferred_skills,
+            experience_requirements=experience_requirements,
+            education_requirements=education_requirements,
+            responsibilities=data.get("responsibilities", []),
+            duties=data.get("duties", []),
+            benefits=data.get("benefits", []),
+            perks=data.get("perks", []),
+            keywords=data.get("keywords", []),
+            industry_keywords=data.get("industry_keywords", []),
+            technology_stack=data.get("technology_stack", []),
+            methodologies=data.get("methodologies", [])
+        )
+    
+    @staticmethod
+    def _build_requirements(items: List[Dict[str, Any]]) -> List[JobRequirement]:
+        """Build JobRequirement objects from the extracted requirement entries"""
+        requirements = []
+        
+        for req_data in items:
+            if not isinstance(req_data, dict):
+                continue
+            requirements.append(JobRequirement(
+                text=req_data.get("text", ""),
+                category=req_data.get("category", "required"),
+                importance=req_data.get("importance", 0.5),
+                keywords=req_data.get("keywords", []),
+                synonyms=req_data.get("synonyms", []),
+                industry_context=req_data.get("industry_context", "")
+            ))
+        
+        return requirements
+    
     def _identify_skill_gaps(self, job_description: JobDescription) -> List[str]:
         """Identify potential skill gaps in the job requirements"""
         skill_gaps = []
@@ -291,9 +640,9 @@ class JobAnalyzer:
                 skill_gaps.append(f"High experience requirement: {skill.skill_name} ({skill.years_experience} years)")
         
         # Check for emerging technologies
-        emerging_tech = ["AI", "Machine Learning", "Blockchain", "IoT", "Edge Computing"]
-        for tech in emerging_tech:
-            if tech.lower() in job_description.description.lower():
+        found_tech = set(EMERGING_TECH_RE.findall(job_description.description_lower))
+        for tech in EMERGING_TECH:
+            if tech.lower() in found_tech:
                 skill_gaps.append(f"Emerging technology: {tech}")
         
         return skill_gaps
@@ -331,19 +680,23 @@ class JobAnalyzer:
             "work_style": "traditional"
         }
         
-        # Analyze benefits for culture insights
-        benefits_text = " ".join(job_description.benefits + job_description.perks).lower()
+        # Analyze benefits for culture insights in one scan
+        benefits_text = job_description.benefits_text_lower
+        if AHOCORASICK_AVAILABLE:
+            signals = {signal for _, signal in CULTURE_SIGNAL_AUTOMATON.iter(benefits_text)}
+        else:
+            signals = {match.lastgroup for match in CULTURE_SIGNAL_RE.finditer(benefits_text)}
         
-        if "flexible" in benefits_text or "remote" in benefits_text:
+        if "flexible" in signals:
             culture_analysis["work_style"] = "flexible"
         
         if "startup" in job_description.company.size.lower():
             culture_analysis["work_style"] = "fast-paced"
         
-        if "health" in benefits_text or "insurance" in benefits_text:
+        if "healthcare" in signals:
             culture_analysis["benefits_focus"].append("healthcare")
         
-        if "equity" in benefits_text or "stock" in benefits_text:
+        if "equity" in signals:
             culture_analysis["benefits_focus"].append("equity")
         
         return culture_analysis
@@ -403,40 +756,16 @@ class JobAnalyzer:
     
     def get_keyword_importance(self, job_description: JobDescription) -> Dict[str, float]:
         """Calculate keyword importance scores"""
-        keyword_importance = {}
-        
-        # Required skills get highest importance
-        for skill in job_description.required_skills:
-            keyword_importance[skill.skill_name.lower()] = 1.0
-        
-        # Preferred skills get medium importance
-        for skill in job_description.preferred_skills:
-            keyword_importance[skill.skill_name.lower()] = 0.7
-        
-        # Technology stack keywords
-        for tech in job_description.technology_stack:
-            keyword_importance[tech.lower()] = 0.8
-        
-        # Industry keywords
-        for keyword in job_description.industry_keywords:
-            keyword_importance[keyword.lower()] = 0.6
-        
-        return keyword_importance
+        # Required skills 1.0, preferred skills 0.7, technology stack 0.8, industry keywords 0.6;
+        # a term listed in several sources takes the weight of the last one, as before
+        return {
+            **{skill.skill_name.lower(): 1.0 for skill in job_description.required_skills},
+            **{skill.skill_name.lower(): 0.7 for skill in job_description.preferred_skills},
+            **{tech.lower(): 0.8 for tech in job_description.technology_stack},
+            **{keyword.lower(): 0.6 for keyword in job_description.industry_keywords},
+        }
     
     def extract_action_verbs(self, job_description: JobDescription) -> List[str]:
         """Extract action verbs from job description"""
-        action_verbs = []
-        
-        # Common action verbs in job descriptions
-        common_verbs = [
-            "develop", "design", "implement", "manage", "lead", "create",
-            "build", "maintain", "optimize", "analyze", "improve", "deliver",
-            "coordinate", "collaborate", "communicate", "solve", "innovate"
-        ]
-        
-        text = job_description.description.lower()
-        for verb in common_verbs:
-            if verb in text:
-                action_verbs.append(verb)
-        
-        return action_verbs 
\ No newline at end of file
+        found = set(ACTION_VERB_RE.findall(job_description.description_lower))
+        return [verb for verb in ACTION_VERBS if verb in found] 
\ No newline at end of file
@@ -1,13 +1,77 @@
 """
 CV data models for the smart CV writer service
 """
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, field, asdict
-import json
+from typing import Dict, Any, Callable, Hashable, Iterable, List, Optional, TypeVar
+from dataclasses import dataclass, field
+import re
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain
 
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
 
-@dataclass
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from ..utils.dataclass_utils import shallow_dict
+from ..utils.fast_json import json_dumps_indented
+
+T = TypeVar("T")
+
+MONTHS = {name: idx for idx, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+ONGOING_DATES = {"", "present", "current", "now", "ongoing", "today"}
+# "Jan 2018" / "January, 2018", "2018-01", "01/2018", then a bare year
+MONTH_NAME_DATE_RE = re.compile(r"\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?,?\s+(\d{4})\b")
+ISO_DATE_RE = re.compile(r"\b(\d{4})[-/.](\d{1,2})\b")
+NUMERIC_DATE_RE = re.compile(r"\b(\d{1,2})[-/.](\d{4})\b")
+YEAR_RE = re.compile(r"\b(\d{4})\b")
+
+
+def _dedupe(items: Iterable[T], key: Callable[[T], Hashable]) -> List[T]:
+    """Keep the first item for each key, preserving order"""
+    seen: Dict[Hashable, T] = {}
+    for item in items:
+        seen.setdefault(key(item), item)
+    return list(seen.values())
+
+
+@lru_cache(maxsize=4096)
+def _parse_month(date_text: str) -> Optional[int]:
+    """Parse a CV date into a month ordinal (year * 12 + month index), or None if unrecognized"""
+    text = date_text.strip().lower()
+    
+    match = MONTH_NAME_DATE_RE.search(text)
+    if match:
+        return int(match.group(2)) * 12 + MONTHS[match.group(1)] - 1
+    match = ISO_DATE_RE.search(text)
+    if match and 1 <= int(match.group(2)) <= 12:
+        return int(match.group(1)) * 12 + int(match.group(2)) - 1
+    match = NUMERIC_DATE_RE.search(text)
+    if match and 1 <= int(match.group(1)) <= 12:
+        return int(match.group(2)) * 12 + int(match.group(1)) - 1
+    match = YEAR_RE.search(text)
+    if match:
+        return int(match.group(1)) * 12
+    return None
+
+
+def _to_json(obj: Any, indent: int) -> str:
+    """Serialize a dataclass to a JSON string"""
+    if MSGSPEC_AVAILABLE:
+        return msgspec.json.format(msgspec.json.encode(obj), indent=indent).decode()
+    return json_dumps_indented(obj.to_dict(), indent)
+
+
+@dataclass(slots=True)
 class ContactInfo:
     full_name: str = ""
     email: str = ""
@@ -17,9 +81,13 @@ class ContactInfo:
     github: str = ""
     portfolio: str = ""
     website: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert dataclass to dictionary (values are shared, not copied)"""
+        return shallow_dict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class EmploymentDetail:
     company: str = ""
     position: str = ""
@@ -33,11 +101,11 @@ class EmploymentDetail:
     impact_metrics: Dict[str, str] = field(default_factory=dict)
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert dataclass to dictionary"""
-        return asdict(self)
+        """Convert dataclass to dictionary (values are shared, not copied)"""
+        return shallow_dict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class Education:
     institution: str = ""
     degree: str = ""
@@ -47,9 +115,13 @@ class Education:
     honors: str = ""
     relevant_courses: List[str] = field(default_factory=list)
     thesis: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert dataclass to dictionary (values are shared, not copied)"""
+        return shallow_dict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class Project:
     name: str = ""
     description: str = ""
@@ -61,9 +133,13 @@ class Project:
     duration: str = ""
     team_size: int = 1
     relevance_score: float = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert dataclass to dictionary (values are shared, not copied)"""
+        return shallow_dict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class Skill:
     name: str = ""
     category: str = ""  # technical, soft, language, certification
@@ -71,6 +147,10 @@ class Skill:
     years_experience: int = 0
     relevance_score: float = 0.0
     keywords: List[str] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert dataclass to dictionary (values are shared, not copied)"""
+        return shallow_dict(self)
 
 
 @dataclass
@@ -96,29 +176,52 @@ class CVData:
     skill_gaps: List[str] = field(default_factory=list)
     improvement_suggestions: List[str] = field(default_factory=list)
 
+    def __post_init__(self):
+        # Lookup caches, rebuilt after the skill lists or employment history change.
+        # Kept off the dataclass fields so they are never serialized or compared.
+        self._skills_lower_cache: Optional[frozenset] = None
+        self._skill_index: Optional[Dict[str, Skill]] = None
+        self._employment_by_company: Optional[Dict[str, EmploymentDetail]] = None
+
     def to_dict(self) -> Dict[str, Any]:
-        """Convert dataclass to dictionary"""
-        return asdict(self)
+        """Convert dataclass to dictionary, sharing leaf values instead of deep-copying them"""
+        data = shallow_dict(self)
+        data["contact_info"] = self.contact_info.to_dict()
+        for name in ("employment_history", "education", "technical_skills", "soft_skills", "languages", "projects"):
+            data[name] = [item.to_dict() for item in data[name]]
+        return data
 
     def to_json(self, indent: int = 2) -> str:
         """Convert to JSON string"""
-        return json.dumps(self.to_dict(), indent=indent, default=str)
+        return _to_json(self, indent)
 
     def get_all_skills(self) -> List[str]:
         """Get all skills as a flat list"""
-        skills = []
-        for skill in self.technical_skills + self.soft_skills + self.languages:
-            skills.append(skill.name)
-        skills.extend(self.certifications)
-        return skills
+        return [skill.name for skill in chain(self.technical_skills, self.soft_skills, self.languages)] + list(self.certifications)
+
+    def get_all_skills_lower(self) -> frozenset:
+        """Get all skill names lowercased, cached until the skills change"""
+        if self._skills_lower_cache is None:
+            self._skills_lower_cache = frozenset(skill.lower() for skill in self.get_all_skills())
+        return self._skills_lower_cache
+
+    def invalidate_skill_cache(self):
+        """Drop cached skill lookups after modifying the skill lists directly"""
+        self._skills_lower_cache = None
+        self._skill_index = None
+
+    def invalidate_employment_cache(self):
+        """Drop cached employment lookups after modifying the employment history directly"""
+        self._employment_by_company = None
 
     def get_skill_by_name(self, skill_name: str) -> Optional[Skill]:
         """Get a skill by name"""
-        all_skills = self.technical_skills + self.soft_skills + self.languages
-        for skill in all_skills:
-            if skill.name.lower() == skill_name.lower():
-                return skill
-        return None
+        if self._skill_index is None:
+            index: Dict[str, Skill] = {}
+            for skill in chain(self.technical_skills, self.soft_skills, self.languages):
+                index.setdefault(skill.name.lower(), skill)
+            self._skill_index = index
+        return self._skill_index.get(skill_name.lower())
 
     def add_skill(self, skill: Skill):
         """Add a skill to the appropriate category"""
@@ -128,22 +231,27 @@ class CVData:
             self.soft_skills.append(skill)
         elif skill.category == "language":
             self.languages.append(skill)
+        self.invalidate_skill_cache()
 
     def remove_skill(self, skill_name: str):
         """Remove a skill by name"""
         for skill_list in [self.technical_skills, self.soft_skills, self.languages]:
             skill_list[:] = [s for s in skill_list if s.name.lower() != skill_name.lower()]
+        self.invalidate_skill_cache()
 
     def get_experience_by_company(self, company_name: str) -> Optional[EmploymentDetail]:
         """Get employment experience by company name"""
-        for job in self.employment_history:
-            if job.company.lower() == company_name.lower():
-                return job
-        return None
+        if self._employment_by_company is None:
+            index: Dict[str, EmploymentDetail] = {}
+            for job in self.employment_history:
+                index.setdefault(job.company.lower(), job)
+            self._employment_by_company = index
+        return self._employment_by_company.get(company_name.lower())
 
     def sort_experience_by_relevance(self):
         """Sort employment history by relevance score"""
         self.employment_history.sort(key=lambda x: x.relevance_score, reverse=True)
+        self.invalidate_employment_cache()
 
     def get_most_relevant_experience(self, limit: int = 5) -> List[EmploymentDetail]:
         """Get the most relevant work experience"""
@@ -151,16 +259,22 @@ class CVData:
         return self.employment_history[:limit]
 
     def calculate_total_experience_years(self) -> float:
-        """Calculate total years of experience"""
-        total_years = 0.0
+        """Calculate total years of experience to month granularity, skipping jobs with unparseable dates"""
+        now = datetime.now()
+        current_month = now.year * 12 + now.month - 1
+        
+        starts, ends = [], []
         for job in self.employment_history:
-            try:
-                start_year = int(job.start_date.split()[-1]) if job.start_date else 0
-                end_year = int(job.end_date.split()[-1]) if job.end_date and job.end_date.lower() != "present" else datetime.now().year
-                total_years += end_year - start_year
-            except (ValueError, IndexError):
+            start = _parse_month(job.start_date)
+            end = current_month if job.end_date.strip().lower() in ONGOING_DATES else _parse_month(job.end_date)
+            if start is None or end is None:
                 continue
-        return total_years
+            starts.append(start)
+            ends.append(end)
+        
+        if NUMPY_AVAILABLE:
+            return float((np.array(ends) - np.array(starts)).sum()) / 12
+        return sum(end - start for start, end in zip(starts, ends)) / 12
 
     def get_skills_by_category(self, category: str) -> List[Skill]:
         """Get skills by category"""
@@ -179,20 +293,26 @@ class CVData:
         # Merge contact info (prefer existing if available)
         merged.contact_info = existing_cv.contact_info if existing_cv.contact_info.full_name else self.contact_info
         
-        # Merge employment history (combine and deduplicate)
-        merged.employment_history = existing_cv.employment_history + self.employment_history
-        # TODO: Add deduplication logic
+        # Merge employment history (combine and deduplicate, existing entries win)
+        merged.employment_history = _dedupe(
+            existing_cv.employment_history + self.employment_history,
+            key=lambda job: (job.company.lower(), job.position.lower(), job.start_date)
+        )
         
         # Merge education
-        merged.education = existing_cv.education + self.education
+        merged.education = _dedupe(
+            existing_cv.education + self.education,
+            key=lambda edu: (edu.institution.lower(), edu.degree.lower())
+        )
         
         # Merge skills (combine and remove duplicates)
-        merged.technical_skills = existing_cv.technical_skills + self.technical_skills
-        merged.soft_skills = existing_cv.soft_skills + self.soft_skills
-        merged.languages = existing_cv.languages + self.languages
+        skill_key = lambda skill: skill.name.lower()
+        merged.technical_skills = _dedupe(existing_cv.technical_skills + self.technical_skills, skill_key)
+        merged.soft_skills = _dedupe(existing_cv.soft_skills + self.soft_skills, skill_key)
+        merged.languages = _dedupe(existing_cv.languages + self.languages, skill_key)
         
         # Merge projects
-        merged.projects = existing_cv.projects + self.projects
+        merged.projects = _dedupe(existing_cv.projects + self.projects, key=lambda project: project.name.lower())
         
         # Use the optimized summary
         merged.summary = self.summary
@@ -215,11 +335,14 @@ class CVOptimizationResult:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return asdict(self)
+        data = shallow_dict(self)
+        data["original_cv"] = self.original_cv.to_dict()
+        data["optimized_cv"] = self.optimized_cv.to_dict()
+        return data
 
     def to_json(self, indent: int = 2) -> str:
         """Convert to JSON string"""
-        return json.dumps(self.to_dict(), indent=indent, default=str)
+        return _to_json(self, indent)
 
 
 @dataclass
@@ -239,4 +362,4 @@ class CVTemplate:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return asdict(self) 
\ No newline at end of file
+        return shallow_dict(self) 
\ No newline at end of file
@@ -1,12 +1,49 @@
 """
 Job description data models for the smart CV writer service
 """
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, field, asdict
-import json
-
-
-@dataclass
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field, InitVar
+from functools import cached_property
+from itertools import chain
+import re
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+from ..utils.dataclass_utils import shallow_dict
+from ..utils.fast_json import json_dumps_indented
+
+# Remote-work phrases, matched anywhere in a word (e.g. "remotely")
+REMOTE_RE = re.compile(r"remote|work from home|wfh|virtual|distributed", re.IGNORECASE)
+
+EXPERIENCE_LEVELS = {
+    "entry": 1,
+    "junior": 2,
+    "mid": 3,
+    "senior": 4,
+    "lead": 5,
+    "executive": 6
+}
+
+COMPANY_SIZES = {
+    "startup": 1,
+    "small": 2,
+    "medium": 3,
+    "large": 4,
+    "enterprise": 5
+}
+
+
+@dataclass(slots=True)
 class JobRequirement:
     """Individual job requirement with metadata"""
     text: str
@@ -15,9 +52,13 @@ class JobRequirement:
     keywords: List[str] = field(default_factory=list)
     synonyms: List[str] = field(default_factory=list)
     industry_context: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert dataclass to dictionary (values are shared, not copied)"""
+        return shallow_dict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class SkillRequirement:
     """Detailed skill requirement"""
     skill_name: str
@@ -27,9 +68,13 @@ class SkillRequirement:
     required: bool = True
     alternatives: List[str] = field(default_factory=list)
     industry_specific: bool = False
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert dataclass to dictionary (values are shared, not copied)"""
+        return shallow_dict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class ExperienceRequirement:
     """Experience requirement details"""
     years_required: int
@@ -37,9 +82,13 @@ class ExperienceRequirement:
     relevant_positions: List[str] = field(default_factory=list)
     industry_preference: List[str] = field(default_factory=list)
     project_scale: str = ""  # small, medium, large, enterprise
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert dataclass to dictionary (values are shared, not copied)"""
+        return shallow_dict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class EducationRequirement:
     """Education requirement details"""
     degree_level: str  # high_school, associate, bachelor, master, phd
@@ -47,9 +96,13 @@ class EducationRequirement:
     required: bool = True
     equivalent_experience: bool = False
     certifications_accepted: List[str] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert dataclass to dictionary (values are shared, not copied)"""
+        return shallow_dict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class CompanyInfo:
     """Company information extracted from job description"""
     name: str = ""
@@ -59,6 +112,10 @@ class CompanyInfo:
     remote_policy: str = ""  # remote, hybrid, on-site
     culture_keywords: List[str] = field(default_factory=list)
     tech_stack: List[str] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert dataclass to dictionary (values are shared, not copied)"""
+        return shallow_dict(self)
 
 
 @dataclass
@@ -97,33 +154,81 @@ class JobDescription:
     extraction_quality: str = ""  # high, medium, low
     missing_information: List[str] = field(default_factory=list)
 
+    def __post_init__(self):
+        # Skill lookups, rebuilt after the skill lists change.
+        # Kept off the dataclass fields so they are never serialized or compared.
+        self._skill_index: Optional[Dict[str, SkillRequirement]] = None
+        self._required_skill_names: Optional[List[str]] = None
+        self._preferred_skill_names: Optional[List[str]] = None
+        self._skills_by_category: Optional[Dict[str, List[SkillRequirement]]] = None
+        # Lowercased text, computed on first use; not refreshed if the source fields are reassigned
+        self._description_lower: Optional[str] = None
+        self._benefits_text_lower: Optional[str] = None
+        # (keywords it was built from, automaton over their lowercase forms)
+        self._keyword_automaton: Optional[Tuple[Tuple[str, ...], Any]] = None
+
+    @property
+    def description_lower(self) -> str:
+        """Lowercased description, computed once"""
+        if self._description_lower is None:
+            self._description_lower = self.description.lower()
+        return self._description_lower
+
+    @property
+    def benefits_text_lower(self) -> str:
+        """Benefits and perks as one lowercased string, computed once"""
+        if self._benefits_text_lower is None:
+            self._benefits_text_lower = " ".join(self.benefits + self.perks).lower()
+        return self._benefits_text_lower
+
     def to_dict(self) -> Dict[str, Any]:
-        """Convert dataclass to dictionary"""
-        return asdict(self)
+        """Convert dataclass to dictionary, sharing list values instead of deep-copying them"""
+        data = shallow_dict(self)
+        data["company"] = self.company.to_dict()
+        data["required_skills"] = [skill.to_dict() for skill in self.required_skills]
+        data["preferred_skills"] = [skill.to_dict() for skill in self.preferred_skills]
+        data["experience_requirements"] = self.experience_requirements.to_dict()
+        data["education_requirements"] = self.education_requirements.to_dict()
+        return data
 
     def to_json(self, indent: int = 2) -> str:
         """Convert to JSON string"""
-        return json.dumps(self.to_dict(), indent=indent, default=str)
+        if ORJSON_AVAILABLE and indent == 2:
+            # orjson serializes the dataclass directly; its underscore-prefixed caches are skipped
+            return orjson.dumps(self, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        return json_dumps_indented(self.to_dict(), indent)
 
     def get_all_required_skills(self) -> List[str]:
-        """Get all required skills as a flat list"""
-        return [skill.skill_name for skill in self.required_skills]
+        """Get all required skills as a flat list (cached; don't modify it)"""
+        if self._required_skill_names is None:
+            self._required_skill_names = [skill.skill_name for skill in self.required_skills]
+        return self._required_skill_names
 
     def get_all_preferred_skills(self) -> List[str]:
-        """Get all preferred skills as a flat list"""
-        return [skill.skill_name for skill in self.preferred_skills]
+        """Get all preferred skills as a flat list (cached; don't modify it)"""
+        if self._preferred_skill_names is None:
+            self._preferred_skill_names = [skill.skill_name for skill in self.preferred_skills]
+        return self._preferred_skill_names
 
     def get_all_skills(self) -> List[str]:
         """Get all skills (required and preferred)"""
         return self.get_all_required_skills() + self.get_all_preferred_skills()
 
+    def invalidate_skill_cache(self):
+        """Drop cached skill lookups after modifying the skill lists directly"""
+        self._skill_index = None
+        self._required_skill_names = None
+        self._preferred_skill_names = None
+        self._skills_by_category = None
+
     def get_skill_by_name(self, skill_name: str) -> Optional[SkillRequirement]:
         """Get a skill requirement by name"""
-        all_skills = self.required_skills + self.preferred_skills
-        for skill in all_skills:
-            if skill.skill_name.lower() == skill_name.lower():
-                return skill
-        return None
+        if self._skill_index is None:
+            index: Dict[str, SkillRequirement] = {}
+            for skill in chain(self.required_skills, self.preferred_skills):
+                index.setdefault(skill.skill_name.lower(), skill)
+            self._skill_index = index
+        return self._skill_index.get(skill_name.lower())
 
     def is_skill_required(self, skill_name: str) -> bool:
         """Check if a skill is required"""
@@ -139,20 +244,26 @@ class JobDescription:
         """Get skills with high importance score"""
         return [skill for skill in self.required_skills if skill.importance >= threshold]
 
+    def get_skills_by_category(self, category: str) -> List[SkillRequirement]:
+        """Get required and preferred skills in a category (cached; don't modify it)"""
+        if self._skills_by_category is None:
+            index: Dict[str, List[SkillRequirement]] = {}
+            for skill in chain(self.required_skills, self.preferred_skills):
+                index.setdefault(skill.category, []).append(skill)
+            self._skills_by_category = index
+        return self._skills_by_category.get(category, [])
+
     def get_technical_skills(self) -> List[SkillRequirement]:
         """Get only technical skills"""
-        return [skill for skill in self.required_skills + self.preferred_skills 
-                if skill.category == "technical"]
+        return self.get_skills_by_category("technical")
 
     def get_soft_skills(self) -> List[SkillRequirement]:
         """Get only soft skills"""
-        return [skill for skill in self.required_skills + self.preferred_skills 
-                if skill.category == "soft"]
+        return self.get_skills_by_category("soft")
 
     def get_tool_skills(self) -> List[SkillRequirement]:
         """Get only tool skills"""
-        return [skill for skill in self.required_skills + self.preferred_skills 
-                if skill.category == "tool"]
+        return self.get_skills_by_category("tool")
 
     def add_skill_requirement(self, skill: SkillRequirement):
         """Add a skill requirement"""
@@ -160,13 +271,16 @@ class JobDescription:
             self.required_skills.append(skill)
         else:
             self.preferred_skills.append(skill)
+        self.invalidate_skill_cache()
 
     def remove_skill_requirement(self, skill_name: str):
         """Remove a skill requirement by name"""
+        name_lower = skill_name.lower()
         self.required_skills[:] = [s for s in self.required_skills 
-                                  if s.skill_name.lower() != skill_name.lower()]
+                                  if s.skill_name.lower() != name_lower]
         self.preferred_skills[:] = [s for s in self.preferred_skills 
-                                   if s.skill_name.lower() != skill_name.lower()]
+                                   if s.skill_name.lower() != name_lower]
+        self.invalidate_skill_cache()
 
     def get_keyword_density(self) -> Dict[str, int]:
         """Calculate keyword density in the job description"""
@@ -174,11 +288,43 @@ class JobDescription:
         text_lower = text.lower()
         keyword_density = {}
         
+        if not AHOCORASICK_AVAILABLE:
+            for keyword in self.keywords:
+                keyword_density[keyword] = text_lower.count(keyword.lower())
+            return keyword_density
+        
+        # One pass over the text for all keywords; like str.count, overlapping repeats of a keyword count once
+        counts: Dict[str, int] = {}
+        last_end: Dict[str, int] = {}
+        automaton = self._get_keyword_automaton()
+        if automaton is not None:
+            for end, keyword_lower in automaton.iter(text_lower):
+                if end - len(keyword_lower) >= last_end.get(keyword_lower, -1):
+                    counts[keyword_lower] = counts.get(keyword_lower, 0) + 1
+                    last_end[keyword_lower] = end
+        
         for keyword in self.keywords:
-            keyword_density[keyword] = text_lower.count(keyword.lower())
+            keyword_lower = keyword.lower()
+            keyword_density[keyword] = counts.get(keyword_lower, 0) if keyword_lower else len(text_lower) + 1
         
         return keyword_density
 
+    def _get_keyword_automaton(self) -> Optional[Any]:
+        """Automaton over the lowercase keywords, rebuilt when the keyword list changes"""
+        keywords = tuple(self.keywords)
+        if self._keyword_automaton is None or self._keyword_automaton[0] != keywords:
+            automaton = ahocorasick.Automaton()
+            for keyword in keywords:
+                keyword_lower = keyword.lower()
+                if keyword_lower:
+                    automaton.add_word(keyword_lower, keyword_lower)
+            if len(automaton):
+                automaton.make_automaton()
+            else:
+                automaton = None
+            self._keyword_automaton = (keywords, automaton)
+        return self._keyword_automaton[1]
+
     def get_industry_context(self) -> str:
         """Get industry context from company and keywords"""
         context_parts = []
@@ -190,57 +336,86 @@ class JobDescription:
 
     def is_remote_friendly(self) -> bool:
         """Check if the job is remote-friendly"""
-        remote_keywords = ["remote", "work from home", "wfh", "virtual", "distributed"]
-        text = f"{self.description} {self.employment_type}".lower()
-        return any(keyword in text for keyword in remote_keywords)
+        return bool(REMOTE_RE.search(self.description) or REMOTE_RE.search(self.employment_type))
 
     def get_experience_level_numeric(self) -> int:
         """Convert experience level to numeric value"""
-        level_mapping = {
-            "entry": 1,
-            "junior": 2,
-            "mid": 3,
-            "senior": 4,
-            "lead": 5,
-            "executive": 6
-        }
-        return level_mapping.get(self.experience_level.lower(), 3)
+        return EXPERIENCE_LEVELS.get(self.experience_level.lower(), 3)
 
     def get_company_size_numeric(self) -> int:
         """Convert company size to numeric value"""
-        size_mapping = {
-            "startup": 1,
-            "small": 2,
-            "medium": 3,
-            "large": 4,
-            "enterprise": 5
-        }
-        return size_mapping.get(self.company.size.lower(), 3)
+        return COMPANY_SIZES.get(self.company.size.lower(), 3)
 
 
 @dataclass
 class JobAnalysisResult:
-    """Result of job description analysis"""
+    """Result of job description analysis; the derived analyses run on first access"""
     job_description: JobDescription
     extracted_requirements: List[JobRequirement]
-    skill_gaps: List[str]
-    industry_insights: Dict[str, Any]
-    company_culture: Dict[str, Any]
-    salary_benchmarks: Dict[str, Any]
     processing_time: float
     confidence_score: float
-    suggestions: List[str] = field(default_factory=list)
+    analyzer: InitVar[Optional[Any]] = None
+
+    def __post_init__(self, analyzer: Optional[Any]):
+        # The JobAnalyzer that computes the lazy analyses; without one they are empty
+        self._analyzer = analyzer
+
+    @cached_property
+    def skill_gaps(self) -> List[str]:
+        if self._analyzer is None:
+            return []
+        return self._analyzer._identify_skill_gaps(self.job_description)
+
+    @cached_property
+    def industry_insights(self) -> Dict[str, Any]:
+        if self._analyzer is None:
+            return {}
+        return self._analyzer._analyze_industry_context(self.job_description)
+
+    @cached_property
+    def company_culture(self) -> Dict[str, Any]:
+        if self._analyzer is None:
+            return {}
+        return self._analyzer._analyze_company_culture(self.job_description)
+
+    @cached_property
+    def salary_benchmarks(self) -> Dict[str, Any]:
+        if self._analyzer is None:
+            return {}
+        return self._analyzer._get_salary_benchmarks(self.job_description)
+
+    @cached_property
+    def suggestions(self) -> List[str]:
+        if self._analyzer is None:
+            return []
+        return self._analyzer._generate_suggestions(self.job_description, self.skill_gaps)
+
+    def compute_all(self) -> "JobAnalysisResult":
+        """Run every lazy analysis now"""
+        for name in ("skill_gaps", "industry_insights", "company_culture", "salary_benchmarks", "suggestions"):
+            getattr(self, name)
+        return self
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return asdict(self)
+        """Convert to dictionary, including the lazy analyses (values are shared, not copied)"""
+        return {
+            "job_description": self.job_description.to_dict(),
+            "extracted_requirements": [requirement.to_dict() for requirement in self.extracted_requirements],
+            "skill_gaps": self.skill_gaps,
+            "industry_insights": self.industry_insights,
+            "company_culture": self.company_culture,
+            "salary_benchmarks": self.salary_benchmarks,
+            "processing_time": self.processing_time,
+            "confidence_score": self.confidence_score,
+            "suggestions": self.suggestions
+        }
 
     def to_json(self, indent: int = 2) -> str:
         """Convert to JSON string"""
-        return json.dumps(self.to_dict(), indent=indent, default=str)
+        return json_dumps_indented(self.to_dict(), indent)
 
 
-@dataclass
+@dataclass(slots=True)
 class JobMarketData:
     """Market data for job analysis"""
     average_salary: float
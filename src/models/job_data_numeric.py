@@ -0,0 +1,27 @@
+"""
+Numeric feature encoding for batches of job descriptions
+"""
+from typing import Iterable
+
+import numpy as np
+
+from .job_data import COMPANY_SIZES, EXPERIENCE_LEVELS, JobDescription
+
+# Code used when a level or size is missing or unrecognized, as in the per-object helpers
+DEFAULT_CODE = 3
+
+
+def experience_level_codes(jobs: Iterable[JobDescription]) -> np.ndarray:
+    """Experience level of each job as a uint8 array (see JobDescription.get_experience_level_numeric)"""
+    return np.fromiter(
+        (EXPERIENCE_LEVELS.get(job.experience_level.lower(), DEFAULT_CODE) for job in jobs),
+        dtype=np.uint8
+    )
+
+
+def company_size_codes(jobs: Iterable[JobDescription]) -> np.ndarray:
+    """Company size of each job as a uint8 array (see JobDescription.get_company_size_numeric)"""
+    return np.fromiter(
+        (COMPANY_SIZES.get(job.company.size.lower(), DEFAULT_CODE) for job in jobs),
+        dtype=np.uint8
+    )
@@ -0,0 +1,144 @@
+"""
+Cache for job description extraction results
+"""
+import copy
+import time
+import math
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionCache:
+    """LRU cache keyed on the SHA-256 of the job text, with an optional embedding-similarity fallback
+    
+    Entries can be partitioned by a namespace; similarity lookups only match entries in the same namespace.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 24 * 3600,
+                 embed: Optional[Callable[[str], List[float]]] = None, similarity_threshold: float = 0.97):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.embed = embed
+        self.similarity_threshold = similarity_threshold
+        # Text hash -> (expiry time, value, normalized embedding or None, namespace)
+        self._entries: "OrderedDict[str, Tuple[float, Any, Optional[List[float]], str]]" = OrderedDict()
+        # Embeddings computed by a missed lookup, reused when the result is stored;
+        # bounded like the entries since a failed extraction never stores its result
+        self._pending_embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @property
+    def semantic(self) -> bool:
+        """Whether near-duplicate lookups by embedding are enabled"""
+        return self.embed is not None
+    
+    @staticmethod
+    def text_key(text: str, namespace: str = "") -> str:
+        """Hash key for a job text"""
+        if namespace:
+            text = f"{namespace}\0{text}"
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    
+    def get(self, text: str, namespace: str = "") -> Optional[Any]:
+        """Get a copy of the cached value for this text or a near-identical one"""
+        key = self.text_key(text, namespace)
+        now = time.monotonic()
+        
+        with self._lock:
+            self._evict_expired(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return copy.deepcopy(entry[1])
+        
+        if not self.semantic:
+            return None
+        
+        embedding = self._embed(text)
+        if embedding is None:
+            return None
+        
+        with self._lock:
+            match_key = self._most_similar(embedding, namespace)
+            if match_key is None:
+                self._pending_embeddings[key] = embedding
+                self._pending_embeddings.move_to_end(key)
+                while len(self._pending_embeddings) > self.maxsize:
+                    self._pending_embeddings.popitem(last=False)
+                return None
+            self._entries.move_to_end(match_key)
+            logger.info("Cached value served from semantic cache")
+            return copy.deepcopy(self._entries[match_key][1])
+    
+    def put(self, text: str, value: Any, namespace: str = ""):
+        """Store a copy of the value for this text"""
+        key = self.text_key(text, namespace)
+        
+        with self._lock:
+            embedding = self._pending_embeddings.pop(key, None)
+        if embedding is None and self.semantic:
+            embedding = self._embed(text)
+        
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, copy.deepcopy(value), embedding, namespace)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+            self._pending_embeddings.clear()
+    
+    def _evict_expired(self, now: float):
+        """Remove entries past their TTL"""
+        expired = [key for key, (expires_at, _, _, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+    
+    def _embed(self, text: str) -> Optional[List[float]]:
+        """Normalized embedding of the text, or None if the embedding request fails"""
+        try:
+            embedding = list(self.embed(text))
+        except Exception as e:
+            logger.warning(f"Error embedding job text for cache lookup: {str(e)}")
+            return None
+        
+        norm = math.sqrt(sum(value * value for value in embedding))
+        if norm == 0:
+            return None
+        return [value / norm for value in embedding]
+    
+    def _most_similar(self, embedding: List[float], namespace: str = "") -> Optional[str]:
+        """Key of the cached entry in the namespace most similar to the embedding, if above the threshold"""
+        candidates = [
+            (key, entry[2]) for key, entry in self._entries.items()
+            if entry[2] is not None and entry[3] == namespace
+        ]
+        if not candidates:
+            return None
+        
+        if NUMPY_AVAILABLE:
+            similarities = np.array([vector for _, vector in candidates]) @ np.array(embedding)
+            best = int(similarities.argmax())
+            best_similarity = float(similarities[best])
+        else:
+            similarities = [sum(a * b for a, b in zip(vector, embedding)) for _, vector in candidates]
+            best = max(range(len(similarities)), key=similarities.__getitem__)
+            best_similarity = similarities[best]
+        
+        if best_similarity >= self.similarity_threshold:
+            return candidates[best][0]
+        return None
@@ -0,0 +1,17 @@
+"""
+Helpers for converting the flat model dataclasses to dictionaries
+"""
+from dataclasses import fields
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+
+@lru_cache(maxsize=None)
+def field_names(cls: type) -> Tuple[str, ...]:
+    """Field names of a dataclass, in declaration order"""
+    return tuple(f.name for f in fields(cls))
+
+
+def shallow_dict(obj: Any) -> Dict[str, Any]:
+    """Map a flat dataclass's fields to their values without copying them"""
+    return {name: getattr(obj, name) for name in field_names(type(obj))}
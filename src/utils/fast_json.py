@@ -0,0 +1,32 @@
+"""
+JSON helpers that use orjson when it is installed
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def json_loads(content: str) -> Any:
+    """Parse JSON with orjson when available (its errors subclass ValueError)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def json_dumps(data: Any) -> str:
+    """Serialize JSON compactly with orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
+
+
+def json_dumps_indented(data: Any, indent: int = 2) -> str:
+    """Serialize JSON for display, stringifying unknown types, with orjson when it supports the indent"""
+    if ORJSON_AVAILABLE and indent == 2:
+        return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, indent=indent, default=str)
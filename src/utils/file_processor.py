@@ -2,43 +2,88 @@
 File processing utilities for the CV writer service
 """
 import os
-import re
+import time
+import codecs
+import shutil
+import zipfile
+import fnmatch
 import logging
-from typing import List, Optional, Tuple
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Load the system MIME tables once at import instead of on the first lookup
+mimetypes.init()
+
+# Read size for hashing when hashlib.file_digest (Python 3.11+) is unavailable
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# WordprocessingML namespace and the run elements that contribute paragraph text
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+WORD_RUN_TEXT = {
+    f"{WORD_NS}tab": "\t",
+    f"{WORD_NS}ptab": "\t",
+    f"{WORD_NS}cr": "\n",
+    f"{WORD_NS}noBreakHyphen": "-"
+}
+
+# Characters that are unsafe in filenames on common filesystems, each mapped to "_"
+UNSAFE_FILENAME_CHARS = str.maketrans({char: "_" for char in '<>:"/\\|?*'})
+
+# Concurrent removals when cleaning up temp files (I/O bound, helps on network filesystems)
+CLEANUP_WORKERS = 8
+
+
+@lru_cache(maxsize=2048)
+def _guess_mime_type(suffixes: str) -> Optional[str]:
+    """MIME type for a lowercased suffix chain such as '.pdf' or '.tar.gz'"""
+    return mimetypes.guess_type(f"file{suffixes}")[0]
+
 
 class FileProcessor:
     """Handles file operations and validation"""
     
     def __init__(self, max_file_size: int = 10 * 1024 * 1024):  # 10MB default
         self.max_file_size = max_file_size
-        self.allowed_extensions = [".pdf", ".docx", ".doc", ".txt"]
-        self.allowed_mime_types = [
+        self.allowed_extensions = frozenset([".pdf", ".docx", ".doc", ".txt"])
+        self.allowed_mime_types = frozenset([
             "application/pdf",
             "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             "application/msword",
             "text/plain"
-        ]
+        ])
+        # Text extractor by lowercased file extension
+        self._extractors = {
+            ".pdf": self._extract_text_from_pdf,
+            ".docx": self._extract_text_from_docx,
+            ".doc": self._extract_text_from_doc,
+            ".txt": self._extract_text_from_text,
+            ".md": self._extract_text_from_text,
+            ".rtf": self._extract_text_from_text
+        }
     
     def validate_file(self, file_path: str) -> Tuple[bool, str]:
         """Validate file for processing"""
         try:
-            # Check if file exists
-            if not os.path.exists(file_path):
+            # Check if file exists; one stat call also provides the size
+            try:
+                file_stat = os.stat(file_path)
+            except OSError:
                 return False, "File does not exist"
             
             # Check file size
-            file_size = os.path.getsize(file_path)
+            file_size = file_stat.st_size
             if file_size > self.max_file_size:
                 return False, f"File size ({file_size} bytes) exceeds maximum allowed size ({self.max_file_size} bytes)"
             
             # Check file extension
             file_extension = Path(file_path).suffix.lower()
             if file_extension not in self.allowed_extensions:
-                return False, f"File extension '{file_extension}' is not supported. Allowed: {', '.join(self.allowed_extensions)}"
+                return False, f"File extension '{file_extension}' is not supported. Allowed: {', '.join(sorted(self.allowed_extensions))}"
             
             # Check if file is readable
             if not os.access(file_path, os.R_OK):
@@ -50,10 +95,11 @@ class FileProcessor:
             logger.error(f"Error validating file {file_path}: {str(e)}")
             return False, f"Error validating file: {str(e)}"
     
-    def get_file_info(self, file_path: str) -> dict:
-        """Get file information"""
+    def get_file_info(self, file_path: str, file_stat: Optional[os.stat_result] = None) -> dict:
+        """Get file information, reusing a stat result the caller already has"""
         try:
-            file_stat = os.stat(file_path)
+            if file_stat is None:
+                file_stat = os.stat(file_path)
             file_path_obj = Path(file_path)
             
             return {
@@ -73,7 +119,7 @@ class FileProcessor:
     def sanitize_filename(self, filename: str) -> str:
         """Sanitize filename for safe file operations"""
         # Remove or replace unsafe characters
-        sanitized = re.sub(r'[<>:"/\\|?*]', '_', filename)
+        sanitized = filename.translate(UNSAFE_FILENAME_CHARS)
         
         # Remove leading/trailing spaces and dots
         sanitized = sanitized.strip('. ')
@@ -98,8 +144,8 @@ class FileProcessor:
         else:
             filename = f"{safe_base}{safe_ext}"
         
-        # Ensure uniqueness by adding timestamp if needed
-        timestamp = int(os.path.getmtime(__file__))  # Use current timestamp
+        # Ensure uniqueness by adding the current time in nanoseconds
+        timestamp = time.time_ns()
         filename = f"{os.path.splitext(filename)[0]}_{timestamp}{safe_ext}"
         
         return filename
@@ -115,34 +161,47 @@ class FileProcessor:
     
     def cleanup_temp_files(self, directory: str, pattern: str = "*", max_age_hours: int = 24) -> int:
         """Clean up temporary files older than specified age"""
-        import time
-        import glob
-        
         try:
             current_time = time.time()
             max_age_seconds = max_age_hours * 3600
-            cleaned_count = 0
-            
-            # Find files matching pattern
-            search_pattern = os.path.join(directory, pattern)
-            files = glob.glob(search_pattern)
+            include_hidden = pattern.startswith(".")
+            expired_files = []
             
-            for file_path in files:
-                try:
-                    file_age = current_time - os.path.getmtime(file_path)
-                    if file_age > max_age_seconds:
-                        os.remove(file_path)
-                        cleaned_count += 1
-                        logger.info(f"Cleaned up old file: {file_path}")
-                except Exception as e:
-                    logger.warning(f"Could not clean up file {file_path}: {str(e)}")
+            # Find old files matching pattern; scandir entries carry their stat result
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith(".") and not include_hidden:
+                        continue
+                    if not fnmatch.fnmatch(entry.name, pattern):
+                        continue
+                    try:
+                        if current_time - entry.stat().st_mtime > max_age_seconds:
+                            expired_files.append(entry.path)
+                    except Exception as e:
+                        logger.warning(f"Could not clean up file {entry.path}: {str(e)}")
             
-            return cleaned_count
+            if not expired_files:
+                return 0
+            with ThreadPoolExecutor(max_workers=min(CLEANUP_WORKERS, len(expired_files))) as executor:
+                return sum(executor.map(self._remove_old_file, expired_files))
             
+        except FileNotFoundError:
+            # Nothing to clean up in a directory that doesn't exist
+            return 0
         except Exception as e:
             logger.error(f"Error during cleanup: {str(e)}")
             return 0
     
+    def _remove_old_file(self, file_path: str) -> bool:
+        """Remove one expired temp file, returning whether it was removed"""
+        try:
+            os.remove(file_path)
+            logger.info(f"Cleaned up old file: {file_path}")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not clean up file {file_path}: {str(e)}")
+            return False
+    
     def get_file_extension(self, file_path: str) -> str:
         """Get file extension"""
         return Path(file_path).suffix.lower()
@@ -165,11 +224,9 @@ class FileProcessor:
     
     def get_mime_type(self, file_path: str) -> Optional[str]:
         """Get MIME type of file"""
-        import mimetypes
-        
         try:
-            mime_type, _ = mimetypes.guess_type(file_path)
-            return mime_type
+            # Only the suffixes decide the type, so lookups are cached per suffix chain
+            return _guess_mime_type("".join(Path(file_path).suffixes).lower())
         except Exception as e:
             logger.error(f"Error getting MIME type for {file_path}: {str(e)}")
             return None
@@ -182,17 +239,11 @@ class FileProcessor:
     def extract_text_from_file(self, file_path: str) -> Optional[str]:
         """Extract text content from file"""
         try:
-            if self.is_pdf_file(file_path):
-                return self._extract_text_from_pdf(file_path)
-            elif self.is_docx_file(file_path):
-                return self._extract_text_from_docx(file_path)
-            elif self.is_doc_file(file_path):
-                return self._extract_text_from_doc(file_path)
-            elif self.is_text_file(file_path):
-                return self._extract_text_from_text(file_path)
-            else:
+            extractor = self._extractors.get(self.get_file_extension(file_path))
+            if extractor is None:
                 logger.error(f"Unsupported file type: {file_path}")
                 return None
+            return extractor(file_path)
                 
         except Exception as e:
             logger.error(f"Error extracting text from {file_path}: {str(e)}")
@@ -203,15 +254,10 @@ class FileProcessor:
         try:
             from pypdf import PdfReader
             
-            reader = PdfReader(file_path)
-            text = ""
-            
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n\n"
+            reader = PdfReader(file_path, strict=False)
+            page_texts = (page.extract_text() for page in reader.pages)
             
-            return text.strip()
+            return "\n\n".join(page_text for page_text in page_texts if page_text).strip()
             
         except Exception as e:
             logger.error(f"Error extracting text from PDF {file_path}: {str(e)}")
@@ -220,17 +266,62 @@ class FileProcessor:
     def _extract_text_from_docx(self, file_path: str) -> Optional[str]:
         """Extract text from DOCX file"""
         try:
-            import docx
-            
-            doc = docx.Document(file_path)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs if paragraph.text])
-            
-            return text.strip()
+            try:
+                return self._stream_docx_text(file_path)
+            except KeyError:
+                # No word/document.xml part where expected; let python-docx resolve the package
+                import docx
+                
+                doc = docx.Document(file_path)
+                text = "\n".join([paragraph.text for paragraph in doc.paragraphs if paragraph.text])
+                
+                return text.strip()
             
         except Exception as e:
             logger.error(f"Error extracting text from DOCX {file_path}: {str(e)}")
             return None
     
+    def _stream_docx_text(self, file_path: str) -> str:
+        """Stream top-level body paragraphs out of word/document.xml without building a document tree"""
+        from lxml import etree
+        
+        body_tag = f"{WORD_NS}body"
+        paragraphs = []
+        with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as document:
+            for _, paragraph in etree.iterparse(document, events=("end",), tag=f"{WORD_NS}p"):
+                parent = paragraph.getparent()
+                if parent is None or parent.tag != body_tag:
+                    # Table and text box paragraphs are skipped, as in python-docx's Document.paragraphs
+                    continue
+                
+                text = self._docx_paragraph_text(paragraph)
+                if text:
+                    paragraphs.append(text)
+                
+                # Free everything parsed so far
+                paragraph.clear()
+                while paragraph.getprevious() is not None:
+                    del parent[0]
+        
+        return "\n".join(paragraphs).strip()
+    
+    def _docx_paragraph_text(self, paragraph: Any) -> str:
+        """Text of a paragraph's runs and hyperlinked runs, with tabs and breaks mapped like python-docx"""
+        parts = []
+        for run in paragraph.iterchildren(f"{WORD_NS}r", f"{WORD_NS}hyperlink"):
+            runs = run.iterchildren(f"{WORD_NS}r") if run.tag == f"{WORD_NS}hyperlink" else (run,)
+            for text_run in runs:
+                for child in text_run.iterchildren():
+                    if child.tag == f"{WORD_NS}t":
+                        parts.append(child.text or "")
+                    elif child.tag == f"{WORD_NS}br":
+                        # Page and column breaks carry no text
+                        if child.get(f"{WORD_NS}type", "textWrapping") == "textWrapping":
+                            parts.append("\n")
+                    else:
+                        parts.append(WORD_RUN_TEXT.get(child.tag, ""))
+        return "".join(parts)
+    
     def _extract_text_from_doc(self, file_path: str) -> Optional[str]:
         """Extract text from DOC file"""
         try:
@@ -246,17 +337,23 @@ class FileProcessor:
     def _extract_text_from_text(self, file_path: str) -> Optional[str]:
         """Extract text from text file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read().strip()
-                
-        except UnicodeDecodeError:
-            # Try with different encoding
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            
+            # Pick the encoding from the byte order mark, falling back to latin-1 for non-UTF-8 files
+            if data.startswith(codecs.BOM_UTF8):
+                encoding = 'utf-8-sig'
+            elif data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+                encoding = 'utf-16'
+            else:
+                encoding = 'utf-8'
             try:
-                with open(file_path, 'r', encoding='latin-1') as f:
-                    return f.read().strip()
-            except Exception as e:
-                logger.error(f"Error reading text file {file_path} with latin-1 encoding: {str(e)}")
-                return None
+                text = data.decode(encoding)
+            except UnicodeDecodeError:
+                text = data.decode('latin-1')
+            
+            # Match text-mode reads, which translate \r\n and \r line endings
+            return text.replace('\r\n', '\n').replace('\r', '\n').strip()
                 
         except Exception as e:
             logger.error(f"Error extracting text from text file {file_path}: {str(e)}")
@@ -298,9 +395,8 @@ class FileProcessor:
             if dest_directory and not self.ensure_directory_exists(dest_directory):
                 return False
             
-            # Copy file
-            import shutil
-            shutil.copy2(source_path, dest_path)
+            # Copy contents only; copyfile uses the kernel's zero-copy path where available
+            shutil.copyfile(source_path, dest_path)
             
             return True
             
@@ -313,13 +409,15 @@ class FileProcessor:
         import hashlib
         
         try:
-            hash_obj = hashlib.new(algorithm)
-            
             with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
+                # file_digest reads and hashes in C without a Python-level loop
+                if hasattr(hashlib, "file_digest"):
+                    return hashlib.file_digest(f, algorithm).hexdigest()
+                
+                hash_obj = hashlib.new(algorithm)
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
                     hash_obj.update(chunk)
-            
-            return hash_obj.hexdigest()
+                return hash_obj.hexdigest()
             
         except Exception as e:
             logger.error(f"Error calculating hash for {file_path}: {str(e)}")
@@ -0,0 +1,68 @@
+"""
+Client-side rate limiting for OpenAI requests
+"""
+import time
+import asyncio
+import threading
+from typing import Any, Dict
+
+
+class RateLimiter:
+    """Token bucket that paces requests below requests-per-minute and tokens-per-minute limits"""
+    
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        # Both buckets start full and refill continuously up to one minute of capacity
+        self._available_requests = float(requests_per_minute)
+        self._available_tokens = float(tokens_per_minute)
+        self._last_update = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens: int):
+        """Block until a request of this many tokens fits under the limits"""
+        while True:
+            wait = self._reserve(tokens)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+    
+    async def acquire_async(self, tokens: int):
+        """Wait without blocking the event loop until a request of this many tokens fits under the limits"""
+        while True:
+            wait = self._reserve(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+    
+    def _reserve(self, tokens: int) -> float:
+        """Take capacity for one request if available, otherwise return the seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._last_update
+            self._last_update = now
+            self._available_requests = min(
+                float(self.requests_per_minute),
+                self._available_requests + elapsed * self.requests_per_minute / 60.0
+            )
+            self._available_tokens = min(
+                float(self.tokens_per_minute),
+                self._available_tokens + elapsed * self.tokens_per_minute / 60.0
+            )
+            
+            # A request larger than the whole bucket waits for a full bucket instead of forever
+            tokens = min(tokens, self.tokens_per_minute)
+            if self._available_requests >= 1 and self._available_tokens >= tokens:
+                self._available_requests -= 1
+                self._available_tokens -= tokens
+                return 0.0
+            
+            request_wait = (1 - self._available_requests) * 60.0 / self.requests_per_minute
+            token_wait = (tokens - self._available_tokens) * 60.0 / self.tokens_per_minute
+            return max(request_wait, token_wait, 0.001)
+
+
+def estimate_request_tokens(request: Dict[str, Any]) -> int:
+    """Rough token cost of a chat completion: about four characters per prompt token plus the completion budget"""
+    prompt_chars = sum(len(message.get("content") or "") for message in request.get("messages", []))
+    return prompt_chars // 4 + request.get("max_tokens", 0)
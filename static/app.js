@@ -0,0 +1,189 @@
+// Prefill the job description with the sample
+fetch('/api/sample-jd')
+    .then(response => response.text())
+    .then(text => {
+        const jobDescription = document.getElementById('jobDescription');
+        if (!jobDescription.value) {
+            jobDescription.value = text;
+        }
+    });
+
+// File upload handling
+document.getElementById('cvFile').addEventListener('change', function(e) {
+    const file = e.target.files[0];
+    if (file) {
+        document.getElementById('fileName').textContent = file.name;
+        document.getElementById('fileInfo').style.display = 'block';
+    }
+});
+
+// Drag and drop functionality
+const fileUpload = document.querySelector('.file-upload');
+
+fileUpload.addEventListener('dragover', function(e) {
+    e.preventDefault();
+    fileUpload.style.borderColor = '#2980b9';
+    fileUpload.style.background = '#e3f2fd';
+});
+
+fileUpload.addEventListener('dragleave', function(e) {
+    e.preventDefault();
+    fileUpload.style.borderColor = '#3498db';
+    fileUpload.style.background = '#f8f9fa';
+});
+
+fileUpload.addEventListener('drop', function(e) {
+    e.preventDefault();
+    fileUpload.style.borderColor = '#3498db';
+    fileUpload.style.background = '#f8f9fa';
+    
+    const files = e.dataTransfer.files;
+    if (files.length > 0) {
+        document.getElementById('cvFile').files = files;
+        document.getElementById('fileName').textContent = files[0].name;
+        document.getElementById('fileInfo').style.display = 'block';
+    }
+});
+
+// Form submission
+document.getElementById('cvForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+    
+    const formData = new FormData();
+    const cvFile = document.getElementById('cvFile').files[0];
+    const jobDescription = document.getElementById('jobDescription').value;
+    const template = document.getElementById('template').value;
+    const includeAnalysis = document.getElementById('include_analysis').value;
+    
+    if (!cvFile) {
+        showError('Please select a CV file');
+        return;
+    }
+    
+    if (!jobDescription.trim()) {
+        showError('Please enter a job description');
+        return;
+    }
+    
+    formData.append('cv_file', cvFile);
+    formData.append('job_description', jobDescription);
+    formData.append('template', template);
+    formData.append('include_analysis', includeAnalysis);
+    
+    // Show loading
+    showLoading(true);
+    hideError();
+    hideResult();
+    
+    try {
+        const response = await fetch('/tailor-cv', {
+            method: 'POST',
+            body: formData
+        });
+        
+        const result = await response.json();
+        
+        if (response.ok) {
+            const status = result.state === 'SUCCESS' ? result : await pollStatus(result.task_id);
+            if (status.state === 'SUCCESS') {
+                showResult(status.result);
+            } else {
+                showError(status.error || status.detail || 'CV generation ended with state ' + status.state);
+            }
+        } else {
+            showError(result.detail || 'An error occurred');
+        }
+    } catch (error) {
+        showError('Network error: ' + error.message);
+    } finally {
+        showLoading(false);
+    }
+});
+
+const POLL_INTERVAL_MS = 2000;
+const POLL_MAX_ATTEMPTS = 300;  // give up after 10 minutes
+const ACTIVE_STATES = ['PENDING', 'STARTED', 'RETRY'];
+
+async function pollStatus(taskId) {
+    for (let attempt = 0; attempt < POLL_MAX_ATTEMPTS; attempt++) {
+        await new Promise(resolve => setTimeout(resolve, POLL_INTERVAL_MS));
+        const response = await fetch('/status/' + taskId);
+        const status = await response.json();
+        if (!response.ok || !ACTIVE_STATES.includes(status.state)) {
+            return status;
+        }
+    }
+    return { state: 'TIMEOUT', error: 'CV generation is taking too long. Please try again later.' };
+}
+
+function showLoading(show) {
+    const loading = document.getElementById('loading');
+    const submitBtn = document.getElementById('submitBtn');
+    
+    if (show) {
+        loading.classList.add('show');
+        submitBtn.disabled = true;
+        submitBtn.textContent = '⏳ Processing...';
+    } else {
+        loading.classList.remove('show');
+        submitBtn.disabled = false;
+        submitBtn.textContent = '🚀 Generate Tailored CV';
+    }
+}
+
+function showResult(result) {
+    const resultDiv = document.getElementById('result');
+    const downloadBtn = document.getElementById('downloadBtn');
+    
+    document.getElementById('optimizationScore').textContent = result.optimization_score + '%';
+    document.getElementById('jobTitle').textContent = result.job_title;
+    document.getElementById('companyName').textContent = result.company_name;
+    document.getElementById('processingTime').textContent = result.processing_time + ' seconds';
+    
+    // Show improvements if available
+    if (result.improvements_made && result.improvements_made.length > 0) {
+        const improvementsList = document.getElementById('improvementsList');
+        improvementsList.innerHTML = '';
+        result.improvements_made.forEach(improvement => {
+            const li = document.createElement('li');
+            li.textContent = improvement;
+            improvementsList.appendChild(li);
+        });
+        document.getElementById('improvementsSection').style.display = 'block';
+    } else {
+        document.getElementById('improvementsSection').style.display = 'none';
+    }
+    
+    // Show skill gaps if available
+    if (result.skill_gaps_identified && result.skill_gaps_identified.length > 0) {
+        const skillGapsList = document.getElementById('skillGapsList');
+        skillGapsList.innerHTML = '';
+        result.skill_gaps_identified.forEach(gap => {
+            const li = document.createElement('li');
+            li.textContent = gap;
+            skillGapsList.appendChild(li);
+        });
+        document.getElementById('skillGapsSection').style.display = 'block';
+    } else {
+        document.getElementById('skillGapsSection').style.display = 'none';
+    }
+    
+    // Set download link
+    downloadBtn.href = '/download/' + result.output_file.split('/').pop();
+    
+    resultDiv.classList.add('show');
+}
+
+function hideResult() {
+    document.getElementById('result').classList.remove('show');
+}
+
+function showError(message) {
+    const errorDiv = document.getElementById('error');
+    document.getElementById('errorMessage').textContent = message;
+    errorDiv.classList.add('show');
+}
+
+function hideError() {
+    document.getElementById('error').classList.remove('show');
+}
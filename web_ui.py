@@ -5,11 +5,24 @@ A simple FastAPI application with HTML interface for uploading and tailoring CVs
 """
 
 import os
+import re
 import sys
 import json
+import gzip
+import uuid
+import asyncio
+import shutil
+import hashlib
 import tempfile
+import threading
+import functools
+import multiprocessing
 from pathlib import Path
-from typing import Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 # Add the src directory to the Python path
 sys.path.append(str(Path(__file__).parent / "src"))
@@ -21,21 +34,116 @@ try:
 except ImportError:
     pass
 
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import (
+    HTMLResponse, FileResponse, JSONResponse, ORJSONResponse, PlainTextResponse, Response, StreamingResponse
+)
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import uvicorn
+import anyio.to_thread
+import aiofiles
+import aiofiles.os
+import aiofiles.tempfile
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:
+    from multipart.multipart import MultipartParser, parse_options_header
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import httptools
+    HTTPTOOLS_AVAILABLE = True
+except ImportError:
+    HTTPTOOLS_AVAILABLE = False
+
+try:
+    from celery import Celery
+    from celery.result import AsyncResult
+    CELERY_AVAILABLE = True
+except ImportError:
+    CELERY_AVAILABLE = False
 
 from generate_tailored_cv import CVTailoringService
+from src.utils.analysis_cache import ExtractionCache
+from src.utils.fast_json import ORJSON_AVAILABLE, json_dumps, json_loads
+from src.utils.file_processor import FileProcessor
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the tailoring service and temp file janitor when a worker starts, and stop them on shutdown"""
+    # Allow enough worker threads for concurrent CV generations (never below anyio's default of 40)
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = max(limiter.total_tokens, GENERATION_THREADS)
+    app.state.service = await anyio.to_thread.run_sync(get_service)
+    janitor = asyncio.create_task(clean_temp_files_periodically())
+    yield
+    janitor.cancel()
+    await anyio.to_thread.run_sync(shutdown_pdf_pool)
+    if app.state.service is not None:
+        await app.state.service.aclose()
+
+async def clean_temp_files_periodically():
+    """Delete stale uploads and generated CVs from the temp directory"""
+    file_processor = FileProcessor()
+    while True:
+        await anyio.to_thread.run_sync(functools.partial(
+            file_processor.cleanup_temp_files, TMP_DIR, max_age_hours=TEMP_FILE_MAX_AGE_HOURS
+        ))
+        await asyncio.sleep(JANITOR_INTERVAL_SECONDS)
 
 # Initialize FastAPI app
 app = FastAPI(
     title="CV Tailoring Service",
     description="AI-powered CV optimization service",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
 )
 
+# Uploads and generated CVs are removed after an hour. They live in RAM-backed /dev/shm only when it
+# has room for many 10 MB uploads (Docker gives it 64 MB by default) or CV_TMPDIR asks for it.
+# Celery workers read the uploads from this directory, so with Celery it must be a volume shared with them.
+TMPFS_MIN_FREE_BYTES = 1024 * 1024 * 1024
+
+
+def default_tmp_dir() -> str:
+    """/dev/shm/cv when tmpfs has enough free space, otherwise a cv folder under the system temp dir"""
+    try:
+        if shutil.disk_usage("/dev/shm").free >= TMPFS_MIN_FREE_BYTES:
+            return "/dev/shm/cv"
+    except OSError:
+        pass
+    return os.path.join(tempfile.gettempdir(), "cv")
+
+
+TMP_DIR = os.getenv("CV_TMPDIR") or default_tmp_dir()
+os.makedirs(TMP_DIR, exist_ok=True)
+TEMP_FILE_MAX_AGE_HOURS = 1
+JANITOR_INTERVAL_SECONDS = 600
+
+# Uploads are streamed to disk and rejected past the size limit
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_FILE_SIZE", 10 * 1024 * 1024))
+MAX_FORM_FIELD_SIZE = 1024 * 1024
+
+# Generated PDFs are served with byte-range support and cached briefly by the browser
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_CACHE_CONTROL = "private, max-age=600"
+RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
+# Internal nginx location aliased to TMP_DIR; when set, downloads are handed to nginx with
+# X-Accel-Redirect so it sends the file with sendfile (zero-copy) and handles ranges itself
+DOWNLOAD_ACCEL_PREFIX = os.getenv("DOWNLOAD_ACCEL_PREFIX")
+
+# Concurrent CV generations run in worker threads so the event loop keeps serving requests,
+# and hand PDF rendering to worker processes (sharing the cores with the other web workers)
+GENERATION_THREADS = 64
+
 # Load sample job description
 SAMPLE_JOB_DESCRIPTION = ""
 try:
@@ -64,608 +172,545 @@ except FileNotFoundError:
     - Experience with agile development methodologies
     """
 
-# Initialize CV Tailoring Service
+# Tailored CVs are reused only for the same CV, options and job description text: a near-identical
+# description can still name another role or company, and the CV would be tailored to the wrong job
+RESPONSE_CACHE_SIZE = 256
+
+# CV Tailoring Service, created per process on first use rather than at import
 api_key = os.getenv("OPENAI_API_KEY")
 if not api_key:
     print("Warning: OPENAI_API_KEY not found in environment variables")
-    service = None
+_service: Optional[CVTailoringService] = None
+_response_cache: Optional[ExtractionCache] = None
+_service_lock = threading.Lock()
+
+
+def get_service() -> Optional[CVTailoringService]:
+    """Shared tailoring service for this process, or None without an API key"""
+    global _service, _response_cache
+    with _service_lock:
+        if _service is None and api_key:
+            _service = CVTailoringService(api_key)
+            _response_cache = ExtractionCache(maxsize=RESPONSE_CACHE_SIZE)
+    return _service
+
+
+def configured_workers() -> int:
+    """Web worker count: WEB_UI_WORKERS, else 2*CPU+1 with Celery and 1 for in-process jobs
+    
+    In-process jobs are only visible to the worker that started them, so they need a single worker.
+    """
+    default_workers = (os.cpu_count() or 1) * 2 + 1 if celery_app is not None else 1
+    return int(os.getenv("WEB_UI_WORKERS", default_workers))
+
+
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_lock = threading.Lock()
+
+
+def get_pdf_pool() -> Optional[ProcessPoolExecutor]:
+    """Process pool for PDF rendering, created on first use; None when Celery workers do the rendering"""
+    global _pdf_pool
+    if celery_app is not None:
+        return None
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # Split the cores between the web workers instead of giving each a full-size pool
+            processes = max(1, (os.cpu_count() or 1) // configured_workers())
+            _pdf_pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+    return _pdf_pool
+
+
+def shutdown_pdf_pool():
+    """Stop the PDF rendering processes, if any were started"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        pool, _pdf_pool = _pdf_pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def get_response_cache() -> Optional[ExtractionCache]:
+    """Response cache that goes with the shared tailoring service"""
+    get_service()
+    return _response_cache
+
+@dataclass(slots=True)
+class TailorResult:
+    """Response payload for a generated CV, slotted to keep the results held for status polling small"""
+    success: bool
+    output_file: str
+    optimization_score: float
+    job_title: str
+    company_name: str
+    processing_time: float
+    improvements_made: List[str] = field(default_factory=list)
+    skill_gaps_identified: List[str] = field(default_factory=list)
+
+# Finished in-process jobs kept for status polling; any other state (SUCCESS, FAILURE, REVOKED, ...) is final
+LOCAL_TASK_LIMIT = 1024
+ACTIVE_STATES = ("PENDING", "STARTED", "RETRY")
+
+
+def run_tailoring(cv_file_path: str, job_description: str, output_path: str,
+                  template_style: str, include_analysis: bool) -> TailorResult:
+    """Generate a tailored CV from an uploaded file and return the response payload"""
+    service = get_service()
+    response_cache = get_response_cache()
+    with open(cv_file_path, "rb") as f:
+        cv_hash = hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+    cache_namespace = f"{cv_hash}:{template_style}:{include_analysis}"
+    
+    cached = response_cache.get(job_description, cache_namespace)
+    if cached is not None and os.path.exists(cached.output_file):
+        os.unlink(cv_file_path)
+        return cached
+    
+    try:
+        results = service.generate_tailored_cv(
+            cv_file_path=cv_file_path,
+            job_description=job_description,
+            output_path=output_path,
+            template_style=template_style,
+            include_analysis=include_analysis,
+            pdf_executor=get_pdf_pool()
+        )
+    finally:
+        # Clean up temporary input file
+        os.unlink(cv_file_path)
+    
+    if not results["success"]:
+        raise RuntimeError(results["error"])
+    
+    payload = TailorResult(
+        success=True,
+        output_file=results["output_file"],
+        optimization_score=results["optimization_score"],
+        job_title=results["job_title"],
+        company_name=results["company_name"],
+        processing_time=results["processing_time"],
+        improvements_made=results.get("improvements_made", []),
+        skill_gaps_identified=results.get("skill_gaps_identified", [])
+    )
+    response_cache.put(job_description, payload, cache_namespace)
+    
+    # Saved next to the PDF so identical resubmissions are answered without regenerating
+    with open(output_path + ".json", "w", encoding="utf-8") as f:
+        f.write(json_dumps(asdict(payload)))
+    return payload
+
+
+def run_tailoring_task(**kwargs) -> Dict[str, Any]:
+    """run_tailoring for Celery, whose JSON serializer needs a plain dict"""
+    return asdict(run_tailoring(**kwargs))
+
+
+# CV generation runs on Celery workers when a Redis broker is configured, otherwise in-process
+REDIS_URL = os.getenv("REDIS_URL")
+if CELERY_AVAILABLE and REDIS_URL:
+    celery_app = Celery("cv", broker=REDIS_URL, backend=REDIS_URL)
+    tailor_task = celery_app.task(run_tailoring_task, name="cv.tailor")
 else:
-    service = CVTailoringService(api_key)
-
-# HTML template for the main page
-MAIN_HTML = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>CV Tailoring Service</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }
-        
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-        }
-        
-        .header {
-            text-align: center;
-            color: white;
-            margin-bottom: 40px;
-        }
-        
-        .header h1 {
-            font-size: 2.5rem;
-            margin-bottom: 10px;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }
-        
-        .header p {
-            font-size: 1.2rem;
-            opacity: 0.9;
-        }
-        
-        .main-content {
-            background: white;
-            border-radius: 15px;
-            padding: 40px;
-            box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-            margin-bottom: 30px;
-        }
-        
-        .upload-section {
-            margin-bottom: 30px;
-        }
-        
-        .upload-section h2 {
-            color: #2c3e50;
-            margin-bottom: 20px;
-            font-size: 1.8rem;
-        }
-        
-        .file-upload {
-            border: 3px dashed #3498db;
-            border-radius: 10px;
-            padding: 40px;
-            text-align: center;
-            background: #f8f9fa;
-            transition: all 0.3s ease;
-            cursor: pointer;
-        }
-        
-        .file-upload:hover {
-            border-color: #2980b9;
-            background: #e3f2fd;
-        }
-        
-        .file-upload input[type="file"] {
-            display: none;
-        }
-        
-        .file-upload label {
-            font-size: 1.2rem;
-            color: #3498db;
-            cursor: pointer;
-            display: block;
-        }
-        
-        .file-upload p {
-            margin-top: 10px;
-            color: #7f8c8d;
-        }
-        
-        .job-description {
-            margin-bottom: 30px;
-        }
-        
-        .job-description h3 {
-            color: #2c3e50;
-            margin-bottom: 15px;
-        }
-        
-        .job-description textarea {
-            width: 100%;
-            height: 200px;
-            padding: 15px;
-            border: 2px solid #e0e0e0;
-            border-radius: 8px;
-            font-family: inherit;
-            font-size: 14px;
-            resize: vertical;
-        }
-        
-        .job-description textarea:focus {
-            outline: none;
-            border-color: #3498db;
-        }
-        
-        .options {
-            margin-bottom: 30px;
-        }
-        
-        .options h3 {
-            color: #2c3e50;
-            margin-bottom: 15px;
-        }
-        
-        .option-group {
-            display: flex;
-            gap: 20px;
-            align-items: center;
-            margin-bottom: 15px;
-        }
-        
-        .option-group label {
-            font-weight: 600;
-            min-width: 120px;
-        }
-        
-        .option-group select {
-            padding: 8px 12px;
-            border: 2px solid #e0e0e0;
-            border-radius: 6px;
-            font-size: 14px;
-        }
-        
-        .option-group select:focus {
-            outline: none;
-            border-color: #3498db;
-        }
-        
-        .submit-btn {
-            background: linear-gradient(135deg, #3498db, #2980b9);
-            color: white;
-            border: none;
-            padding: 15px 40px;
-            font-size: 1.1rem;
-            border-radius: 8px;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            width: 100%;
-        }
-        
-        .submit-btn:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 10px 20px rgba(52, 152, 219, 0.3);
-        }
-        
-        .submit-btn:disabled {
-            background: #bdc3c7;
-            cursor: not-allowed;
-            transform: none;
-            box-shadow: none;
-        }
-        
-        .loading {
-            display: none;
-            text-align: center;
-            margin: 20px 0;
-        }
-        
-        .loading.show {
-            display: block;
-        }
-        
-        .spinner {
-            border: 4px solid #f3f3f3;
-            border-top: 4px solid #3498db;
-            border-radius: 50%;
-            width: 40px;
-            height: 40px;
-            animation: spin 1s linear infinite;
-            margin: 0 auto 15px;
-        }
-        
-        @keyframes spin {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
-        
-        .result {
-            display: none;
-            background: #f8f9fa;
-            border-radius: 10px;
-            padding: 20px;
-            margin-top: 20px;
-        }
-        
-        .result.show {
-            display: block;
-        }
-        
-        .result h3 {
-            color: #27ae60;
-            margin-bottom: 15px;
-        }
-        
-        .result-item {
-            margin-bottom: 10px;
-        }
-        
-        .result-item strong {
-            color: #2c3e50;
-        }
-        
-        .download-btn {
-            background: #27ae60;
-            color: white;
-            border: none;
-            padding: 10px 20px;
-            border-radius: 6px;
-            cursor: pointer;
-            text-decoration: none;
-            display: inline-block;
-            margin-top: 10px;
-        }
-        
-        .download-btn:hover {
-            background: #229954;
-        }
-        
-        .error {
-            background: #f8d7da;
-            color: #721c24;
-            padding: 15px;
-            border-radius: 6px;
-            margin-top: 20px;
-            display: none;
-        }
-        
-        .error.show {
-            display: block;
-        }
-        
-        .footer {
-            text-align: center;
-            color: white;
-            opacity: 0.8;
-            margin-top: 30px;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🎯 CV Tailoring Service</h1>
-            <p>AI-powered CV optimization for your dream job</p>
-        </div>
-        
-        <div class="main-content">
-            <form id="cvForm" enctype="multipart/form-data">
-                <div class="upload-section">
-                    <h2>📄 Upload Your CV</h2>
-                    <div class="file-upload" onclick="document.getElementById('cvFile').click()">
-                        <input type="file" id="cvFile" name="cv_file" accept=".pdf,.docx,.txt" required>
-                        <label for="cvFile">
-                            <strong>📁 Click to upload CV</strong><br>
-                            <span>or drag and drop here</span>
-                        </label>
-                        <p>Supported formats: PDF, DOCX, TXT (Max 10MB)</p>
-                    </div>
-                    <div id="fileInfo" style="margin-top: 10px; display: none;">
-                        <strong>Selected file:</strong> <span id="fileName"></span>
-                    </div>
-                </div>
-                
-                <div class="job-description">
-                    <h3>🎯 Job Description</h3>
-                    <textarea name="job_description" id="jobDescription" placeholder="Paste the job description here..." required>""" + SAMPLE_JOB_DESCRIPTION + """</textarea>
-                </div>
-                
-                <div class="options">
-                    <h3>⚙️ Options</h3>
-                    <div class="option-group">
-                        <label for="template">Template Style:</label>
-                        <select name="template" id="template">
-                            <option value="modern">Modern</option>
-                            <option value="professional">Professional</option>
-                            <option value="creative">Creative</option>
-                        </select>
-                    </div>
-                    <div class="option-group">
-                        <label for="include_analysis">Include Analysis:</label>
-                        <select name="include_analysis" id="include_analysis">
-                            <option value="true">Yes</option>
-                            <option value="false">No</option>
-                        </select>
-                    </div>
-                </div>
-                
-                <button type="submit" class="submit-btn" id="submitBtn">
-                    🚀 Generate Tailored CV
-                </button>
-            </form>
-            
-            <div class="loading" id="loading">
-                <div class="spinner"></div>
-                <p>Processing your CV... This may take a few minutes.</p>
-            </div>
-            
-            <div class="result" id="result">
-                <h3>✅ CV Generated Successfully!</h3>
-                <div class="result-item">
-                    <strong>Optimization Score:</strong> <span id="optimizationScore"></span>
-                </div>
-                <div class="result-item">
-                    <strong>Job Title:</strong> <span id="jobTitle"></span>
-                </div>
-                <div class="result-item">
-                    <strong>Company:</strong> <span id="companyName"></span>
-                </div>
-                <div class="result-item">
-                    <strong>Processing Time:</strong> <span id="processingTime"></span>
-                </div>
-                <div class="result-item" id="improvementsSection" style="display: none;">
-                    <strong>Improvements Made:</strong>
-                    <ul id="improvementsList"></ul>
-                </div>
-                <div class="result-item" id="skillGapsSection" style="display: none;">
-                    <strong>Skill Gaps Identified:</strong>
-                    <ul id="skillGapsList"></ul>
-                </div>
-                <a href="#" class="download-btn" id="downloadBtn">📥 Download Tailored CV</a>
-            </div>
-            
-            <div class="error" id="error">
-                <strong>Error:</strong> <span id="errorMessage"></span>
-            </div>
-        </div>
-        
-        <div class="footer">
-            <p>Powered by OpenAI • CV Tailoring Service v1.0</p>
-        </div>
-    </div>
-    
-    <script>
-        // File upload handling
-        document.getElementById('cvFile').addEventListener('change', function(e) {
-            const file = e.target.files[0];
-            if (file) {
-                document.getElementById('fileName').textContent = file.name;
-                document.getElementById('fileInfo').style.display = 'block';
-            }
-        });
-        
-        // Drag and drop functionality
-        const fileUpload = document.querySelector('.file-upload');
-        
-        fileUpload.addEventListener('dragover', function(e) {
-            e.preventDefault();
-            fileUpload.style.borderColor = '#2980b9';
-            fileUpload.style.background = '#e3f2fd';
-        });
-        
-        fileUpload.addEventListener('dragleave', function(e) {
-            e.preventDefault();
-            fileUpload.style.borderColor = '#3498db';
-            fileUpload.style.background = '#f8f9fa';
-        });
-        
-        fileUpload.addEventListener('drop', function(e) {
-            e.preventDefault();
-            fileUpload.style.borderColor = '#3498db';
-            fileUpload.style.background = '#f8f9fa';
-            
-            const files = e.dataTransfer.files;
-            if (files.length > 0) {
-                document.getElementById('cvFile').files = files;
-                document.getElementById('fileName').textContent = files[0].name;
-                document.getElementById('fileInfo').style.display = 'block';
-            }
-        });
-        
-        // Form submission
-        document.getElementById('cvForm').addEventListener('submit', async function(e) {
-            e.preventDefault();
-            
-            const formData = new FormData();
-            const cvFile = document.getElementById('cvFile').files[0];
-            const jobDescription = document.getElementById('jobDescription').value;
-            const template = document.getElementById('template').value;
-            const includeAnalysis = document.getElementById('include_analysis').value;
-            
-            if (!cvFile) {
-                showError('Please select a CV file');
-                return;
-            }
-            
-            if (!jobDescription.trim()) {
-                showError('Please enter a job description');
-                return;
-            }
-            
-            formData.append('cv_file', cvFile);
-            formData.append('job_description', jobDescription);
-            formData.append('template', template);
-            formData.append('include_analysis', includeAnalysis);
-            
-            // Show loading
-            showLoading(true);
-            hideError();
-            hideResult();
-            
-            try {
-                const response = await fetch('/tailor-cv', {
-                    method: 'POST',
-                    body: formData
-                });
-                
-                const result = await response.json();
-                
-                if (response.ok) {
-                    showResult(result);
-                } else {
-                    showError(result.detail || 'An error occurred');
-                }
-            } catch (error) {
-                showError('Network error: ' + error.message);
-            } finally {
-                showLoading(false);
-            }
-        });
-        
-        function showLoading(show) {
-            const loading = document.getElementById('loading');
-            const submitBtn = document.getElementById('submitBtn');
-            
-            if (show) {
-                loading.classList.add('show');
-                submitBtn.disabled = true;
-                submitBtn.textContent = '⏳ Processing...';
-            } else {
-                loading.classList.remove('show');
-                submitBtn.disabled = false;
-                submitBtn.textContent = '🚀 Generate Tailored CV';
-            }
-        }
-        
-        function showResult(result) {
-            const resultDiv = document.getElementById('result');
-            const downloadBtn = document.getElementById('downloadBtn');
-            
-            document.getElementById('optimizationScore').textContent = result.optimization_score + '%';
-            document.getElementById('jobTitle').textContent = result.job_title;
-            document.getElementById('companyName').textContent = result.company_name;
-            document.getElementById('processingTime').textContent = result.processing_time + ' seconds';
-            
-            // Show improvements if available
-            if (result.improvements_made && result.improvements_made.length > 0) {
-                const improvementsList = document.getElementById('improvementsList');
-                improvementsList.innerHTML = '';
-                result.improvements_made.forEach(improvement => {
-                    const li = document.createElement('li');
-                    li.textContent = improvement;
-                    improvementsList.appendChild(li);
-                });
-                document.getElementById('improvementsSection').style.display = 'block';
-            } else {
-                document.getElementById('improvementsSection').style.display = 'none';
-            }
-            
-            // Show skill gaps if available
-            if (result.skill_gaps_identified && result.skill_gaps_identified.length > 0) {
-                const skillGapsList = document.getElementById('skillGapsList');
-                skillGapsList.innerHTML = '';
-                result.skill_gaps_identified.forEach(gap => {
-                    const li = document.createElement('li');
-                    li.textContent = gap;
-                    skillGapsList.appendChild(li);
-                });
-                document.getElementById('skillGapsSection').style.display = 'block';
-            } else {
-                document.getElementById('skillGapsSection').style.display = 'none';
-            }
-            
-            // Set download link
-            downloadBtn.href = '/download/' + result.output_file.split('/').pop();
-            
-            resultDiv.classList.add('show');
-        }
-        
-        function hideResult() {
-            document.getElementById('result').classList.remove('show');
-        }
-        
-        function showError(message) {
-            const errorDiv = document.getElementById('error');
-            document.getElementById('errorMessage').textContent = message;
-            errorDiv.classList.add('show');
-        }
-        
-        function hideError() {
-            document.getElementById('error').classList.remove('show');
-        }
-    </script>
-</body>
-</html>
-"""
+    celery_app = None
+
+# In-process job id -> {"state": ..., "result": ..., "error": ...}
+local_tasks: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+local_task_handles = set()
+# Output path -> id of the task generating it, so identical concurrent requests share one generation
+inflight_tasks: "OrderedDict[str, str]" = OrderedDict()
+
+
+async def run_local_task(task_id: str, **kwargs):
+    """Run a CV generation in a worker thread and record its outcome"""
+    local_tasks[task_id]["state"] = "STARTED"
+    try:
+        result = await anyio.to_thread.run_sync(functools.partial(run_tailoring, **kwargs))
+        local_tasks[task_id].update(state="SUCCESS", result=result)
+    except Exception as e:
+        local_tasks[task_id].update(state="FAILURE", error=str(e))
+
+
+def enqueue_tailoring(**kwargs) -> str:
+    """Queue a CV generation and return its task id"""
+    if celery_app is not None:
+        return tailor_task.delay(**kwargs).id
+    
+    task_id = uuid.uuid4().hex
+    local_tasks[task_id] = {"state": "PENDING"}
+    while len(local_tasks) > LOCAL_TASK_LIMIT:
+        oldest_id = next(iter(local_tasks))
+        if local_tasks[oldest_id]["state"] in ACTIVE_STATES:
+            break
+        local_tasks.popitem(last=False)
+    
+    handle = asyncio.create_task(run_local_task(task_id, **kwargs))
+    local_task_handles.add(handle)
+    handle.add_done_callback(local_task_handles.discard)
+    return task_id
+
+
+async def submit_tailoring(**kwargs) -> str:
+    """Queue a CV generation, or join the task already generating the same output, and return its id"""
+    output_path = kwargs["output_path"]
+    running_id = inflight_tasks.get(output_path)
+    if running_id is not None:
+        status = await anyio.to_thread.run_sync(task_status, running_id)
+        if status is not None and status["state"] in ACTIVE_STATES:
+            await aiofiles.os.unlink(kwargs["cv_file_path"])
+            return running_id
+    
+    task_id = enqueue_tailoring(**kwargs)
+    inflight_tasks[output_path] = task_id
+    inflight_tasks.move_to_end(output_path)
+    while len(inflight_tasks) > LOCAL_TASK_LIMIT:
+        inflight_tasks.popitem(last=False)
+    return task_id
+
+
+def task_status(task_id: str) -> Optional[Dict[str, Any]]:
+    """State of a queued CV generation, or None if the id is unknown"""
+    if celery_app is not None:
+        async_result = AsyncResult(task_id, app=celery_app)
+        status = {"task_id": task_id, "state": async_result.state}
+        if async_result.successful():
+            status["result"] = async_result.result
+        elif async_result.failed():
+            status["error"] = str(async_result.result)
+        return status
+    
+    task = local_tasks.get(task_id)
+    if task is None:
+        return None
+    return {"task_id": task_id, **task}
+
+# Main page and its script, also served as plain files under /static so a reverse proxy can serve them directly
+STATIC_DIR = Path(__file__).parent / "static"
+
+# The script is served from a content-hashed path so browsers can cache it indefinitely
+APP_JS_BYTES = (STATIC_DIR / "app.js").read_bytes()
+APP_JS_GZIP = gzip.compress(APP_JS_BYTES, compresslevel=9)
+APP_JS_VERSION = hashlib.blake2b(APP_JS_BYTES, digest_size=8).hexdigest()
+APP_JS_HEADERS = {"Cache-Control": "public, max-age=31536000, immutable", "Vary": "Accept-Encoding"}
+
+MAIN_HTML = (STATIC_DIR / "index.html").read_text(encoding="utf-8").replace(
+    'src="/static/app.js"', f'src="/assets/app.{APP_JS_VERSION}.js"'
+)
+
+# The page is static, so it is encoded, compressed and tagged once
+MAIN_HTML_BYTES = MAIN_HTML.encode("utf-8")
+MAIN_HTML_GZIP = gzip.compress(MAIN_HTML_BYTES, compresslevel=9)
+MAIN_HTML_ETAG = f'"{hashlib.blake2b(MAIN_HTML_BYTES, digest_size=16).hexdigest()}"'
+MAIN_HTML_HEADERS = {"Cache-Control": "public, max-age=3600", "ETag": MAIN_HTML_ETAG, "Vary": "Accept-Encoding"}
+
+
+def precompressed_response(request: Request, body: bytes, gzip_body: bytes,
+                           media_type: str, headers: Dict[str, str]) -> Response:
+    """Send the gzip body to clients that accept it, otherwise the plain body"""
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(gzip_body, media_type=media_type, headers={**headers, "Content-Encoding": "gzip"})
+    return Response(body, media_type=media_type, headers=headers)
+
+app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+
+class UploadSizeLimitMiddleware:
+    """Reject uploads whose declared size is over the limit before reading the body
+    
+    Plain ASGI rather than @app.middleware("http"), so other responses are not piped through
+    BaseHTTPMiddleware's memory stream.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == "/tailor-cv":
+            content_length = dict(scope["headers"]).get(b"content-length", b"")
+            if content_length.isdigit() and int(content_length) > MAX_UPLOAD_SIZE:
+                response = JSONResponse(
+                    {"detail": f"Upload exceeds maximum allowed size ({MAX_UPLOAD_SIZE} bytes)"},
+                    status_code=413
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+app.add_middleware(UploadSizeLimitMiddleware)
 
 @app.get("/", response_class=HTMLResponse)
-async def home():
+async def home(request: Request):
     """Main page with the CV upload form"""
-    return MAIN_HTML
+    if request.headers.get("if-none-match") == MAIN_HTML_ETAG:
+        return Response(status_code=304, headers=MAIN_HTML_HEADERS)
+    
+    return precompressed_response(request, MAIN_HTML_BYTES, MAIN_HTML_GZIP, "text/html", MAIN_HTML_HEADERS)
+
+@app.get("/assets/app.{version}.js")
+async def app_script(version: str, request: Request):
+    """Page script under its content-hashed path"""
+    if version != APP_JS_VERSION:
+        raise HTTPException(status_code=404, detail="Not found")
+    return precompressed_response(request, APP_JS_BYTES, APP_JS_GZIP, "text/javascript", APP_JS_HEADERS)
+
+@app.get("/api/sample-jd", response_class=PlainTextResponse)
+async def sample_job_description():
+    """Sample job description used to prefill the form"""
+    return PlainTextResponse(SAMPLE_JOB_DESCRIPTION, headers={"Cache-Control": "public, max-age=3600"})
 
 @app.post("/tailor-cv")
-async def tailor_cv(
-    cv_file: UploadFile = File(...),
-    job_description: str = Form(...),
-    template: str = Form("modern"),
-    include_analysis: str = Form("true")
-):
-    """Process CV upload and generate tailored CV"""
-    if not service:
+async def tailor_cv(request: Request):
+    """Accept a CV upload (cv_file, job_description, template, include_analysis) and queue generation of the tailored CV"""
+    if not request.app.state.service:
         raise HTTPException(status_code=500, detail="OpenAI API key not configured")
     
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or not options.get(b"boundary"):
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+    
     try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(cv_file.filename).suffix) as temp_file:
-            content = await cv_file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-        
-        # Generate output filename
-        output_filename = f"tailored_cv_{int(os.path.getmtime(temp_file_path))}.pdf"
-        output_path = os.path.join(tempfile.gettempdir(), output_filename)
-        
-        # Process CV
-        results = service.generate_tailored_cv(
+        # Stream the uploaded file straight to a temporary file, hashing it along the way
+        form = CVUploadForm(options[b"boundary"])
+        await form.read(request)
+        
+        job_description = form.fields.get("job_description", "")
+        if form.file_path is None or not job_description:
+            await form.discard()
+            raise HTTPException(status_code=422, detail="cv_file and job_description are required")
+        
+        temp_file_path = form.file_path
+        content_hash = form.content_hash
+        template = form.fields.get("template", "modern")
+        include_analysis_flag = form.fields.get("include_analysis", "true").lower() == "true"
+        
+        # Name the output after everything that determines it, so identical requests share one PDF
+        for part in (job_description, template, str(include_analysis_flag)):
+            content_hash.update(b"\0" + part.encode("utf-8"))
+        output_filename = f"tailored_cv_{content_hash.hexdigest()}.pdf"
+        output_path = os.path.join(TMP_DIR, output_filename)
+        
+        if await aiofiles.os.path.exists(output_path):
+            try:
+                async with aiofiles.open(output_path + ".json", "r", encoding="utf-8") as f:
+                    result = TailorResult(**json_loads(await f.read()))
+                await aiofiles.os.unlink(temp_file_path)
+                return {"task_id": None, "state": "SUCCESS", "result": result}
+            except FileNotFoundError:
+                pass
+        
+        # Queue CV processing and let the client poll for the result
+        task_id = await submit_tailoring(
             cv_file_path=temp_file_path,
             job_description=job_description,
             output_path=output_path,
             template_style=template,
-            include_analysis=include_analysis.lower() == "true"
+            include_analysis=include_analysis_flag
         )
-        
-        # Clean up temporary input file
-        os.unlink(temp_file_path)
-        
-        if results["success"]:
-            return {
-                "success": True,
-                "output_file": results["output_file"],
-                "optimization_score": results["optimization_score"],
-                "job_title": results["job_title"],
-                "company_name": results["company_name"],
-                "processing_time": results["processing_time"],
-                "improvements_made": results.get("improvements_made", []),
-                "skill_gaps_identified": results.get("skill_gaps_identified", [])
-            }
-        else:
-            raise HTTPException(status_code=500, detail=results["error"])
+        return {"task_id": task_id, "state": "PENDING"}
             
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/status/{task_id}")
+async def get_status(task_id: str):
+    """State of a queued CV generation, with its result once finished"""
+    # The Celery lookup makes blocking Redis calls
+    status = await anyio.to_thread.run_sync(task_status, task_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return status
+
+class CVUploadForm:
+    """Multipart /tailor-cv form parsed from the request stream, with the CV file written straight to disk"""
+    
+    def __init__(self, boundary: bytes):
+        self.fields: Dict[str, str] = {}
+        self.file_path: Optional[str] = None
+        self.file_size = 0
+        self.content_hash = hashlib.blake2b(digest_size=16)
+        
+        # File operations queued by the parser callbacks, run asynchronously after each chunk
+        self._file_events: List[Tuple[str, Any]] = []
+        self._file = None
+        self._header_field = b""
+        self._header_value = b""
+        self._part_name = ""
+        self._part_filename: Optional[str] = None
+        self._part_value = bytearray()
+        self._part_is_cv = False
+        
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end
+        })
+    
+    async def read(self, request: Request):
+        """Consume the request body, discarding the CV file on any error"""
+        try:
+            async for chunk in request.stream():
+                self._parser.write(chunk)
+                await self._run_file_events()
+            self._parser.finalize()
+            await self._run_file_events()
+        except ValueError as e:
+            await self.discard()
+            raise HTTPException(status_code=400, detail=f"Malformed upload: {str(e)}")
+        except BaseException:
+            await self.discard()
+            raise
+    
+    async def discard(self):
+        """Close and delete the CV file"""
+        if self._file is not None:
+            await self._file.close()
+            self._file = None
+        if self.file_path is not None:
+            await aiofiles.os.unlink(self.file_path)
+            self.file_path = None
+    
+    async def _run_file_events(self):
+        """Open, write and close the CV file as queued by the parser"""
+        events, self._file_events = self._file_events, []
+        for kind, value in events:
+            if kind == "open":
+                self._file = await aiofiles.tempfile.NamedTemporaryFile("wb", delete=False, suffix=value, dir=TMP_DIR)
+                self.file_path = self._file.name
+            elif kind == "data":
+                self.file_size += len(value)
+                if self.file_size > MAX_UPLOAD_SIZE:
+                    raise HTTPException(status_code=413, detail=f"File exceeds maximum allowed size ({MAX_UPLOAD_SIZE} bytes)")
+                self.content_hash.update(value)
+                await self._file.write(value)
+            elif kind == "close":
+                await self._file.close()
+                self._file = None
+    
+    def _on_part_begin(self):
+        self._part_name = ""
+        self._part_filename = None
+        self._part_value = bytearray()
+        self._part_is_cv = False
+    
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+    
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+    
+    def _on_header_end(self):
+        if self._header_field.lower() == b"content-disposition":
+            _, options = parse_options_header(self._header_value)
+            self._part_name = options.get(b"name", b"").decode("utf-8")
+            filename = options.get(b"filename")
+            self._part_filename = filename.decode("utf-8") if filename is not None else None
+        self._header_field = b""
+        self._header_value = b""
+    
+    def _on_headers_finished(self):
+        # Only the first CV file is kept; other file parts are dropped
+        if self._part_name == "cv_file" and self._part_filename is not None and self.file_path is None:
+            self._part_is_cv = True
+            self._file_events.append(("open", Path(self._part_filename).suffix))
+    
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if self._part_is_cv:
+            self._file_events.append(("data", data[start:end]))
+        elif self._part_filename is None:
+            self._part_value += data[start:end]
+            if len(self._part_value) > MAX_FORM_FIELD_SIZE:
+                raise HTTPException(status_code=413, detail=f"Form field {self._part_name} is too large")
+    
+    def _on_part_end(self):
+        if self._part_is_cv:
+            self._file_events.append(("close", None))
+        elif self._part_filename is None:
+            self.fields[self._part_name] = self._part_value.decode("utf-8")
+
+def parse_byte_range(start: str, end: str, file_size: int) -> Optional[Tuple[int, int]]:
+    """Inclusive (start, end) offsets for a single byte range, or None if it cannot be satisfied"""
+    if not start:
+        if not end or int(end) == 0:
+            return None
+        return max(file_size - int(end), 0), file_size - 1
+    
+    first = int(start)
+    last = min(int(end), file_size - 1) if end else file_size - 1
+    if first > last:
+        return None
+    return first, last
+
+def iter_file_range(file_path: str, start: int, end: int) -> Iterator[bytes]:
+    """Read an inclusive byte range of a file in chunks"""
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
 @app.get("/download/{filename}")
-async def download_file(filename: str):
-    """Download generated CV file"""
-    file_path = os.path.join(tempfile.gettempdir(), filename)
+async def download_file(filename: str, request: Request):
+    """Download generated CV file, whole or as a byte range"""
+    file_path = os.path.join(TMP_DIR, filename)
     
-    if not os.path.exists(file_path):
+    try:
+        file_stat = await aiofiles.os.stat(file_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found")
     
+    headers = {"Cache-Control": DOWNLOAD_CACHE_CONTROL, "Accept-Ranges": "bytes"}
+    if DOWNLOAD_ACCEL_PREFIX:
+        headers.update({
+            "X-Accel-Redirect": f"{DOWNLOAD_ACCEL_PREFIX.rstrip('/')}/{filename}",
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        })
+        return Response(media_type='application/pdf', headers=headers)
+    
+    range_match = RANGE_RE.match(request.headers.get("range", "").replace(" ", ""))
+    if range_match:
+        byte_range = parse_byte_range(*range_match.groups(), file_stat.st_size)
+        if byte_range is None:
+            raise HTTPException(
+                status_code=416,
+                detail="Requested range not satisfiable",
+                headers={"Content-Range": f"bytes */{file_stat.st_size}"}
+            )
+        
+        start, end = byte_range
+        headers.update({
+            "Content-Range": f"bytes {start}-{end}/{file_stat.st_size}",
+            "Content-Length": str(end - start + 1),
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        })
+        return StreamingResponse(
+            iter_file_range(file_path, start, end),
+            status_code=206,
+            media_type='application/pdf',
+            headers=headers
+        )
+    
+    # FileResponse streams the file in chunks from Python (uvicorn has no sendfile path);
+    # stat_result lets it set Content-Length without another stat
     return FileResponse(
         path=file_path,
         filename=filename,
-        media_type='application/pdf'
+        media_type='application/pdf',
+        stat_result=file_stat,
+        headers=headers
     )
 
 @app.get("/health")
-async def health_check():
+async def health_check(response: Response):
     """Health check endpoint"""
+    response.headers["Cache-Control"] = "no-store"
     return {"status": "healthy", "service": "cv_tailoring_web_ui"}
 
 if __name__ == "__main__":
@@ -673,10 +718,16 @@ if __name__ == "__main__":
     print("📱 Open your browser and go to: http://localhost:8000")
     print("🔑 Make sure your OpenAI API key is set in the .env file")
     
+    # Several workers for throughput; a single worker keeps auto-reload for development
+    workers = configured_workers()
+    
     uvicorn.run(
         "web_ui:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        workers=workers,
+        reload=workers == 1,
+        loop="uvloop" if UVLOOP_AVAILABLE else "auto",
+        http="httptools" if HTTPTOOLS_AVAILABLE else "auto",
         log_level="info"
     ) 
\ No newline at end of file